@@ -16,6 +16,11 @@ class AgentManager:
         self.agents: Dict[str, dict] = self._load_agents()
         self.current_agent: Optional[str] = None
         self.current_network: NetworkType = "testnet"  # Default to testnet for safety
+        self._current_agent_info: Optional[dict] = None  # memoized get_current_agent()
+
+    def _invalidate_cache(self):
+        """Drop the memoized current-agent info after any mutating operation"""
+        self._current_agent_info = None
 
     def _load_agents(self) -> Dict[str, dict]:
         """Load agents from config file"""
@@ -34,6 +39,7 @@ class AgentManager:
         if network.lower() not in ["mainnet", "testnet"]:
             raise ValueError("Network must be either 'mainnet' or 'testnet'")
         self.current_network = network.lower()
+        self._invalidate_cache()
 
     def get_current_network(self) -> NetworkType:
         """Get current network"""
@@ -61,6 +67,7 @@ class AgentManager:
 
         self.agents[name] = agent_info
         self._save_agents()
+        self._invalidate_cache()
         return agent_info
 
     def delete_agent(self, name: str):
@@ -72,18 +79,20 @@ class AgentManager:
         if self.current_agent == name:
             self.current_agent = None
         self._save_agents()
+        self._invalidate_cache()
 
     def switch_agent(self, name: str):
         """Switch to a different agent"""
         if name not in self.agents:
             raise ValueError(f"Agent '{name}' not found")
         self.current_agent = name
+        self._invalidate_cache()
 
     def get_current_agent(self) -> Optional[dict]:
         """Get current agent information"""
-        if self.current_agent:
-            return self.agents[self.current_agent]
-        return None
+        if self._current_agent_info is None and self.current_agent:
+            self._current_agent_info = self.agents[self.current_agent]
+        return self._current_agent_info
 
     def list_agents(self) -> Dict[str, dict]:
         """List all available agents"""
@@ -8,50 +8,290 @@ CLI客户端界面 - Injective Agent API
 新文件名：quick_start_client.py
 """
 
+import atexit
+import hashlib
+import io
+import itertools
 import os
+import queue
+import re
 import sys
-import time
 import threading
+import time
+from contextlib import contextmanager
+from collections import deque
+from concurrent.futures import (
+    ThreadPoolExecutor,
+    TimeoutError as FuturesTimeout,
+    as_completed,
+)
 from datetime import datetime
+from operator import itemgetter
 import colorama
 from colorama import Fore, Style, Back
-import requests
-import argparse
-import json
-from decimal import Decimal
+import difflib
+import orjson
 from typing import Dict, Optional
-from pyinjective.core.network import Network
-from app.agent_manager import AgentManager
+
+# 重量级依赖（requests、argparse、pyinjective、AgentManager）按需延迟导入，
+# 缩短 --help / 快速退出等启动关键路径的冷启动时间
+
+try:
+    # 可选依赖：prompt_toolkit 提供更快的提示符重绘、历史记录和补全
+    from prompt_toolkit import PromptSession
+    from prompt_toolkit.completion import WordCompleter
+    from prompt_toolkit.formatted_text import ANSI
+    from prompt_toolkit.history import FileHistory
+except ImportError:
+    PromptSession = None
+
+try:
+    # 可选依赖：rapidfuzz 的 Levenshtein-ratio 质量和速度都优于字节计数
+    from rapidfuzz import process as _rf_process
+except ImportError:
+    _rf_process = None
 
 
 # Initialize colorama for cross-platform colored output
 colorama.init()
 
+# 热路径上反复使用的 ANSI 序列提前取出为常量，避免每次 f-string
+# 都经过 colorama 的属性描述符并重新拼接字符串；
+# 输出被重定向（非 TTY）时直接置空，日志/管道里不混入转义序列
+if sys.stdout.isatty():
+    _R, _G, _Y, _C, _B, _W, _BGB, _RST = (
+        Fore.RED,
+        Fore.GREEN,
+        Fore.YELLOW,
+        Fore.CYAN,
+        Fore.BLUE,
+        Fore.WHITE,
+        Back.BLUE,
+        Style.RESET_ALL,
+    )
+else:
+    _R = _G = _Y = _C = _B = _W = _BGB = _RST = ""
+
+# wei -> 主单位的除数与余额表头只算一次；余额格式化走整数 divmod，
+# 不需要任何 Decimal 运算
+_WEI = 10 ** 18
+_BALANCE_HEADER = f"{_C}Account Balances:{_RST}"
+
+# 单个响应体的上限：流式读入并计数，失控的超大回复不会吃光内存
+_MAX_RESPONSE_BYTES = 4 * 1024 * 1024
+
+# 转账输入的三种写法（可选 transfer/send 前缀）统一成一条预编译正则，
+# 整个解析在 C 层一次完成
+_TRANSFER_RE = re.compile(
+    r"^\s*(?:transfer\s+|send\s+)?(\d+(?:\.\d+)?|\.\d+)\s+([A-Za-z][A-Za-z0-9]*)\s+to\s+(\S+)\s*$",
+    re.IGNORECASE,
+)
+
+# 响应类型判定用的键集合：frozenset 与 dict_keys 做 C 级交集，
+# 代替每次响应都新建 list 再逐键 in 探测
+_TX_KEYS = frozenset({"result", "gas_wanted", "gas_fee"})
+_BALANCE_KEY = "balances"
+
+# netcheck 每行结果的三个字段用 C 实现的 itemgetter 一次取出
+# （服务端 EndpointResult 数据类保证键始终存在）
+_NC_GET = itemgetter("reachable", "latency_ms", "target")
+
+# 等待动画帧：连同 \r 前缀和颜色码一次性格式化好，循环里用
+# itertools.cycle 取帧，免去取模和索引运算
+_SPINNER_FRAMES = tuple(
+    f"\r{_Y}Processing transaction {c}{_RST}"
+    for c in ("⠋", "⠙", "⠹", "⠸", "⠼", "⠴", "⠦", "⠧", "⠇", "⠏")
+)
+
+
+def _close_matches(word, candidates, n=3, cutoff=0.6):
+    """返回与 word 最接近的候选命令
+
+    整个打分循环都在本地代码里跑：优先 rapidfuzz 的批量 extract
+    （C++ 实现），否则退回 difflib 的 C 级 Ratcliff-Obershelp。
+    """
+    if _rf_process is not None:
+        return [
+            match
+            for match, _score, _idx in _rf_process.extract(
+                word, candidates, limit=n, score_cutoff=cutoff * 100
+            )
+        ]
+    return difflib.get_close_matches(word, candidates, n=n, cutoff=cutoff)
+
 
 class InjectiveCLI:
     """Enhanced CLI interface with agent management"""
 
-    def __init__(self, api_url: str, debug: bool = False):
-        self.api_url = api_url
+    def __init__(self, api_url: str, debug: bool = False, hedge_delay_ms: int = 0):
+        # 规范化一次，省去每次请求的 rstrip/lstrip 和字符串分配
+        self.api_url = api_url.rstrip("/")
+        self._chat_url = f"{self.api_url}/chat"
+        self._ping_url = f"{self.api_url}/ping"
+        # 端点 -> 完整 URL 的备忘表，带斜杠与不带斜杠的写法都预填热点项
+        self._url_cache = {
+            "/chat": self._chat_url,
+            "chat": self._chat_url,
+            "/ping": self._ping_url,
+            "ping": self._ping_url,
+        }
         self.debug = debug
         self.session_id = datetime.now().strftime("%Y%m%d-%H%M%S")
-        self.animation_stop = False
-        self.animation_thread = None  # 初始化 animation_thread 属性
+        from app.agent_manager import AgentManager
+
         self.agent_manager = AgentManager()
         
-        # 会话管理
+        # 会话管理；历史用带上限的 deque，写满后追加是 O(1) 而非 pop(0) 的整体搬移
         self.session_start_time = datetime.now()
-        self.command_history = []
+        self.command_history = deque(maxlen=50)
+        # 会话时长串的 1 秒缓存：(上次计算时刻, 结果)
+        self._dur_cache = (float("-inf"), "")
+
+        # 请求公共字段模板：session_id/environment 粘在实例上，
+        # 只在切换网络时更新，各查询路径做一次浅合并即可
+        self._req_base = {
+            "session_id": self.session_id,
+            "environment": self.agent_manager.get_current_network(),
+        }
+
+        # 对冲只读查询的延迟阈值（毫秒，0 关闭）；线程池按需创建
+        self.hedge_delay_ms = hedge_delay_ms
+        self._hedge_pool: Optional[ThreadPoolExecutor] = None
+
+        # 后台任务线程池（连接预热、切换代理后的查询预取等）
+        self._executor = ThreadPoolExecutor(max_workers=4)
+        # 进行中的预取任务，重复切换代理时先取消上一批
+        self._warm_futures: list = []
+
+        # 共享 HTTP 会话（懒初始化，见 session 属性）；
+        # 异常退出路径也要释放连接池，兜底挂一个 atexit
+        self._session = None
+        atexit.register(self.close)
+
+        # 只读查询的响应缓存：键为请求摘要，值为 (到期时间, 响应)。
+        # 键里含 agent_id/environment，切换代理或网络自然失效
+        self._resp_cache: dict = {}
+        self._resp_cache_ttl = 60.0
+        self._resp_cache_max = 256
+
+        # Network 对象按网络名缓存：构造会携带整套 RPC 端点配置，
+        # 没必要每次格式化网络信息时重建
+        self._networks = {}
+        # 格式化后的网络信息串同样按网络名缓存：来回切换网络时
+        # 两个条目各算一次即可，无需显式失效
+        self._net_details: dict = {}
         
         # 智能命令识别系统
         self._init_smart_command_system()
-    
+
+        # 横幅的静态部分（ASCII 标题和命令列表）只拼接一次，
+        # display_banner 每次只格式化动态的会话/网络/代理行
+        self._banner_art = "\n".join(
+            [
+                _C + "=" * 80,
+                _B
+                + """
+        ██╗███╗   ██╗     ██╗███████╗ ██████╗████████╗██╗██╗   ██╗███████╗
+        ██║████╗  ██║     ██║██╔════╝██╔════╝╚══██╔══╝██║██║   ██║██╔════╝
+        ██║██╔██╗ ██║     ██║█████╗  ██║        ██║   ██║██║   ██║█████╗
+        ██║██║╚██╗██║██   ██║██╔══╝  ██║        ██║   ██║╚██╗ ██╔╝██╔══╝
+        ██║██║ ╚████║╚█████╔╝███████╗╚██████╗   ██║   ██║ ╚████╔╝ ███████╗
+        ╚═╝╚═╝  ╚═══╝ ╚════╝ ╚══════╝ ╚═════╝   ╚═╝   ╚═╝  ╚═══╝  ╚══════╝
+        """
+                + _RST,
+                f"{_BGB}{_W} Injective Chain Interactive Agent CLI Client {_RST}",
+            ]
+        )
+        self._banner_footer = "\n".join(
+            [
+                _C + "=" * 80,
+                f"{_Y}Available Commands:",
+                "General: quit, clear, help, history, ping, debug, session, cache_clear",
+                "Network: switch_network [mainnet|testnet]",
+                "Agents: create_agent, delete_agent, switch_agent, list_agents",
+                "Blockchain: check balance, get orders, show markets, view positions, transfer",
+                "Direct Commands: transfer, balance, orders, markets, positions, history, dashboard",
+                "Server: shutdown_server [token]",
+                "=" * 80 + _RST,
+            ]
+        )
+
+        # 输入会话：prompt_toolkit 共享终端驱动，避免每次 input() 重新初始化
+        # readline；不可用时回退到内置 input()
+        self._prompt_session = None
+        if PromptSession is not None:
+            known_commands = sorted(
+                self.special_commands
+                | self.agent_commands
+                | self.direct_commands
+                | self.composite_prefixes
+            )
+            self._prompt_session = PromptSession(
+                history=FileHistory(os.path.join(os.path.expanduser("~"), ".iagent_history")),
+                completer=WordCompleter(known_commands, ignore_case=True),
+            )
+
+    @property
+    def session(self):
+        """懒初始化的 requests.Session：连接池 + keep-alive + 轻量重试
+
+        复用同一个会话让重复请求跳过 TCP/TLS 握手；默认头也挂在会话上，
+        省去每次调用重建 headers 字典。
+        """
+        if self._session is None:
+            import requests
+            from requests.adapters import HTTPAdapter, Retry
+
+            s = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=4,
+                pool_maxsize=8,
+                max_retries=Retry(
+                    total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504]
+                ),
+            )
+            s.mount("http://", adapter)
+            s.mount("https://", adapter)
+            s.headers.update(
+                {"Content-Type": "application/json", "Accept": "application/json"}
+            )
+            self._session = s
+        return self._session
+
+    def close(self):
+        """释放共享 HTTP 会话和后台线程池"""
+        # 不等待在途任务并丢弃排队任务：退出时不被挂起的
+        # session.post（最长 60s 超时）拖住进程
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        if self._hedge_pool is not None:
+            self._hedge_pool.shutdown(wait=False, cancel_futures=True)
+            self._hedge_pool = None
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+    def _read_command(self) -> str:
+        """读取一条用户命令（优先使用 prompt_toolkit 会话）"""
+        prompt_text = f"{_G}Command: {_RST}"
+        if self._prompt_session is not None:
+            return self._prompt_session.prompt(ANSI(prompt_text))
+        return input(prompt_text)
+
     def _init_smart_command_system(self):
         """初始化智能命令识别系统"""
-        # 特殊命令（General）- 这些是系统级别的命令，需要特殊处理
-        self.special_commands = {
-            "quit", "clear", "help", "history", "ping", "debug", "session"
+        # 特殊命令（General）- 与 _agent_handlers 同构的分发表；
+        # 命令集合直接取分发表的键，不另维护一份列表
+        self._special_handlers = {
+            "quit": self._cmd_quit,
+            "clear": self._cmd_clear,
+            "help": self._cmd_help,
+            "history": self._cmd_history,
+            "ping": self._cmd_ping,
+            "debug": self._cmd_debug,
+            "session": self._cmd_session,
+            "cache_clear": self._cmd_cache_clear,
         }
+        self.special_commands = set(self._special_handlers)
         
         # 代理管理命令（Agents）- 这些是代理相关的系统命令
         self.agent_commands = {
@@ -67,7 +307,8 @@ class InjectiveCLI:
         # 添加直接支持的命令（无需复合格式）
         self.direct_commands = {
             "transfer", "send", "tx", "balance", "balances", "bal",
-            "orders", "markets", "positions", "history"
+            "orders", "markets", "positions", "history",
+            "dashboard", "status", "all"
         }
         
         # 添加查询命令（用于复合命令格式）
@@ -80,6 +321,42 @@ class InjectiveCLI:
         self.action_commands = {
             "transfer", "send", "tx", "create", "cancel", "update"
         }
+
+        # 代理命令分发表：O(1) 查表取代逐条 if/elif 比较，
+        # 未知命令建议也直接复用这里的键，避免重复维护命令列表
+        self._agent_handlers = {
+            "switch_network": self._cmd_switch_network,
+            "create_agent": self._cmd_create_agent,
+            "delete_agent": self._cmd_delete_agent,
+            "switch_agent": self._cmd_switch_agent,
+            "list_agents": self._cmd_list_agents,
+            "shutdown_server": self._cmd_shutdown_server,
+            "netcheck": self._cmd_netcheck,
+        }
+
+        # 复合/直接子命令分发表：别名 -> 处理方法，内层 if 链同样换成查表
+        self._composite_dispatch = {}
+        for aliases, handler in (
+            (("balance", "balances", "bal"), self._handle_balance_command),
+            (("order", "orders", "orderbook"), self._handle_orders_command),
+            (("market", "markets", "ticker"), self._handle_markets_command),
+            (("position", "positions", "pos"), self._handle_positions_command),
+            (("history", "hist", "transactions"), self._handle_history_command),
+            (("dashboard", "status", "all"), self._handle_dashboard_command),
+            (("transfer", "send", "tx"), self._handle_transfer_command),
+        ):
+            for alias in aliases:
+                self._composite_dispatch[alias] = handler
+
+        # 全量命令表（元组）：拼写建议一次批量匹配即可，不再逐集合扫描
+        self._all_commands = tuple(
+            self.special_commands
+            | self.agent_commands
+            | self.direct_commands
+            | self.query_commands
+            | self.action_commands
+            | self.composite_prefixes
+        )
     
     def _smart_command_router(self, command: str, args: str) -> bool:
         """
@@ -87,23 +364,26 @@ class InjectiveCLI:
         
         将复杂命令识别交给AI模型处理，只处理简单命令
         """
+        # 规范化一次，后续查表和各 handler 都直接用小写串
+        command = command.lower()
+
         # 1. 处理特殊命令（General）- 这些是系统级别的命令
-        if command.lower() in self.special_commands:
+        if command in self.special_commands:
             if self._handle_special_commands(command, args):
                 return True
-        
+
         # 2. 处理代理相关命令（Agents）- 这些是代理管理命令
-        if command.lower() in self.agent_commands:
+        if command in self.agent_commands:
             if self.handle_agent_commands(command, args):
                 return True
-        
+
         # 3. 处理直接命令（如 transfer, balance 等）
-        if command.lower() in self.direct_commands:
+        if command in self.direct_commands:
             if self._handle_direct_command(command, args):
                 return True
-        
+
         # 4. 处理复合命令（向后兼容，如 check balance, get balance 等）
-        if command.lower() in self.composite_prefixes and args:
+        if command in self.composite_prefixes and args:
             if self._handle_composite_command(command, args):
                 return True
         
@@ -122,88 +402,109 @@ class InjectiveCLI:
         - ping: 测试服务器连接
         - debug: 切换调试模式
         - session: 显示会话信息
+        - cache_clear: 清空查询缓存
         """
-        try:
-            if command == "quit":
-                print(f"\n{Fore.YELLOW}Exiting Injective Chain CLI... 👋{Style.RESET_ALL}")
-                sys.exit(0)
-                
-            elif command == "clear":
-                self.clear_screen()
-                self.display_banner()
-                return True
-                
-            elif command == "help":
-                self.display_banner()
-                return True
-                
-            elif command == "history":
-                if hasattr(self, 'command_history') and self.command_history:
-                    print(f"{Fore.CYAN}📜 命令历史记录:{Style.RESET_ALL}")
-                    for i, cmd in enumerate(self.command_history[-10:], 1):  # 显示最近10条
-                        print(f"  {i:2d}. {cmd}")
-                else:
-                    print(f"{Fore.YELLOW}📜 暂无命令历史记录{Style.RESET_ALL}")
-                return True
-                
-            elif command == "ping":
-                # 实现ping命令
-                try:
-                    url = f"{self.api_url.rstrip('/')}/ping"
-                    headers = {"Content-Type": "application/json", "Accept": "application/json"}
-                    
-                    print(f"{Fore.YELLOW}Pinging server at {url}...{Style.RESET_ALL}")
-                    response = requests.get(url, headers=headers, timeout=10)
-                    
-                    if response.status_code == 200:
-                        data = response.json()
-                        print(f"{Fore.GREEN}✅ Server is online!{Style.RESET_ALL}")
-                        print(f"   Status: {data.get('status', 'unknown')}")
-                        print(f"   Version: {data.get('version', 'unknown')}")
-                        print(f"   Timestamp: {data.get('timestamp', 'unknown')}")
-                    else:
-                        print(f"{Fore.RED}❌ Server responded with status code: {response.status_code}{Style.RESET_ALL}")
-                        
-                except requests.exceptions.Timeout:
-                    print(f"{Fore.RED}❌ Request timed out. Server may be offline or slow.{Style.RESET_ALL}")
-                except requests.exceptions.ConnectionError:
-                    print(f"{Fore.RED}❌ Connection failed. Server may be offline.{Style.RESET_ALL}")
-                except Exception as e:
-                    print(f"{Fore.RED}❌ Ping failed: {str(e)}{Style.RESET_ALL}")
-                return True
-                
-            elif command == "debug":
-                # 切换调试模式
-                self.debug = not self.debug
-                status = "开启" if self.debug else "关闭"
-                print(f"{Fore.GREEN}✅ 调试模式已{status}{Style.RESET_ALL}")
-                return True
-                
-            elif command == "session":
-                # 显示会话信息
-                print(f"{Fore.CYAN}📊 会话信息:{Style.RESET_ALL}")
-                print(f"  Session ID: {self.session_id}")
-                print(f"  API URL: {self.api_url}")
-                print(f"  Current Network: {self._format_network_details()}")
-                print(f"  Debug Mode: {'开启' if self.debug else '关闭'}")
-                
-                current_agent = self.agent_manager.get_current_agent()
-                if current_agent:
-                    print(f"  Current Agent: {self.agent_manager.current_agent}")
-                    print(f"  Agent Address: {current_agent['address']}")
-                else:
-                    print(f"  Current Agent: 未选择")
-                
-                if hasattr(self, 'command_history'):
-                    print(f"  Commands Executed: {len(self.command_history)}")
-                return True
-                
+        handler = self._special_handlers.get(command)
+        if handler is None:
             return False
-            
+        try:
+            return handler(args)
         except Exception as e:
-            print(f"{Fore.RED}❌ 处理特殊命令时出错: {str(e)}{Style.RESET_ALL}")
+            print(f"{_R}❌ 处理特殊命令时出错: {str(e)}{_RST}")
             return False
 
+    def _cmd_quit(self, args: str) -> bool:
+        print(f"\n{_Y}Exiting Injective Chain CLI... 👋{_RST}")
+        self._shutdown()
+
+    def _shutdown(self, code: int = 0):
+        """释放资源后立即结束进程
+
+        预取/对冲池里可能还有被慢请求拖住的非守护工作线程，
+        sys.exit 会在 concurrent.futures 的退出钩子里 join 它们；
+        资源已显式释放，直接 os._exit 让退出不被在途请求拖住。
+        """
+        self.close()
+        sys.stdout.flush()
+        os._exit(code)
+
+    def _cmd_clear(self, args: str) -> bool:
+        self.clear_screen()
+        self.display_banner()
+        return True
+
+    def _cmd_help(self, args: str) -> bool:
+        self.display_banner()
+        return True
+
+    def _cmd_history(self, args: str) -> bool:
+        if hasattr(self, 'command_history') and self.command_history:
+            with self._buffered_out() as b:
+                b.write(f"{_C}📜 命令历史记录:{_RST}\n")
+                for i, cmd in enumerate(list(self.command_history)[-10:], 1):  # 显示最近10条
+                    b.write(f"  {i:2d}. {cmd}\n")
+        else:
+            print(f"{_Y}📜 暂无命令历史记录{_RST}")
+        return True
+
+    def _cmd_ping(self, args: str) -> bool:
+        try:
+            import requests
+
+            url = self._ping_url
+            print(f"{_Y}Pinging server at {url}...{_RST}")
+            response = self.session.get(url, timeout=10)
+
+            if response.status_code == 200:
+                data = response.json()
+                print(f"{_G}✅ Server is online!{_RST}")
+                print(f"   Status: {data.get('status', 'unknown')}")
+                print(f"   Version: {data.get('version', 'unknown')}")
+                print(f"   Timestamp: {data.get('timestamp', 'unknown')}")
+            else:
+                print(f"{_R}❌ Server responded with status code: {response.status_code}{_RST}")
+
+        except requests.exceptions.Timeout:
+            print(f"{_R}❌ Request timed out. Server may be offline or slow.{_RST}")
+        except requests.exceptions.ConnectionError:
+            print(f"{_R}❌ Connection failed. Server may be offline.{_RST}")
+        except Exception as e:
+            print(f"{_R}❌ Ping failed: {str(e)}{_RST}")
+        return True
+
+    def _cmd_debug(self, args: str) -> bool:
+        # 切换调试模式
+        self.debug = not self.debug
+        status = "开启" if self.debug else "关闭"
+        print(f"{_G}✅ 调试模式已{status}{_RST}")
+        return True
+
+    def _cmd_cache_clear(self, args: str) -> bool:
+        # 清空只读查询的响应缓存
+        self._resp_cache.clear()
+        print(f"{_G}✅ 查询缓存已清空{_RST}")
+        return True
+
+    def _cmd_session(self, args: str) -> bool:
+        # 显示会话信息
+        with self._buffered_out() as b:
+            b.write(f"{_C}📊 会话信息:{_RST}\n")
+            b.write(f"  Session ID: {self.session_id}\n")
+            b.write(f"  API URL: {self.api_url}\n")
+            b.write(f"  Current Network: {self._format_network_details()}\n")
+            b.write(f"  Debug Mode: {'开启' if self.debug else '关闭'}\n")
+
+            current_agent = self.agent_manager.get_current_agent()
+            if current_agent:
+                b.write(f"  Current Agent: {self.agent_manager.current_agent}\n")
+                b.write(f"  Agent Address: {current_agent['address']}\n")
+            else:
+                b.write(f"  Current Agent: 未选择\n")
+
+            if hasattr(self, 'command_history'):
+                b.write(f"  Commands Executed: {len(self.command_history)}\n")
+        return True
+
     def _handle_ai_command(self, user_input: str) -> bool:
         """
         通过AI模型处理复杂命令
@@ -216,11 +517,11 @@ class InjectiveCLI:
         """
         current_agent = self.agent_manager.get_current_agent()
         if not current_agent:
-            print(f"{Fore.RED}❌ 请先选择代理{Style.RESET_ALL}")
+            print(f"{_R}❌ 请先选择代理{_RST}")
             print(f"   使用 'switch_agent' 命令选择代理")
             return True
         
-        print(f"{Fore.CYAN}🤖 正在通过AI代理分析您的命令...{Style.RESET_ALL}")
+        print(f"{_C}🤖 正在通过AI代理分析您的命令...{_RST}")
         
         # 构建智能AI请求
         ai_prompt = f"""
@@ -246,25 +547,24 @@ class InjectiveCLI:
         try:
             # 发送到AI代理
             request_data = {
+                **self._req_base,
                 "message": ai_prompt,
-                "session_id": self.session_id,
                 "agent_id": current_agent.get('address'),
                 "agent_key": current_agent.get('private_key'),
-                "environment": self.agent_manager.get_current_network(),
             }
             
-            # 启动动画
-            self.start_animation()
-            
-            # 发送请求
-            response = self.make_request("/chat", request_data)
-            
-            # 停止动画
-            self.stop_animation()
-            
+            # 发送请求（主线程驱动等待动画）
+            response = self._request_with_spinner("/chat", request_data, agent=current_agent)
+
+            # AI 路径可能在服务端执行了转账等变更操作（response 里带
+            # function_call）；与 _do_transfer 一样，成功后清掉只读缓存，
+            # 否则 60s 内 balance/positions 会命中转账前的旧快照
+            if response and response.get("function_call"):
+                self._resp_cache.clear()
+
             # 显示结果
             if response and "response" in response:
-                print(f"\n{Fore.GREEN}✅ AI智能处理结果:{Style.RESET_ALL}")
+                print(f"\n{_G}✅ AI智能处理结果:{_RST}")
                 self.display_response(response.get("response"), response if self.debug else None)
                 
                 # 显示函数调用信息
@@ -277,13 +577,12 @@ class InjectiveCLI:
                     if isinstance(fresult, dict) and not status and fresult.get("error"):
                         print(f"   错误: {fresult.get('error')}")
             else:
-                print(f"{Fore.RED}❌ AI处理失败: 服务器无响应{Style.RESET_ALL}")
+                print(f"{_R}❌ AI处理失败: 服务器无响应{_RST}")
             
             return True
             
         except Exception as e:
-            self.stop_animation()
-            print(f"{Fore.RED}❌ AI处理失败: {str(e)}{Style.RESET_ALL}")
+            print(f"{_R}❌ AI处理失败: {str(e)}{_RST}")
             return True
     
     def _provide_command_suggestions(self, command: str):
@@ -305,38 +604,35 @@ class InjectiveCLI:
                 suggestions.append(f"{command_lower}")
                 suggestions.append(f"check {command_lower}")
         
-        # 检查查询命令（避免重复）
-        for query_cmd in self.query_commands:
-            if (query_cmd.startswith(command_lower) or command_lower in query_cmd) and query_cmd != command_lower:
-                suggestions.append(f"check {query_cmd}")
-                suggestions.append(f"get {query_cmd}")
-        
-        # 检查操作命令（避免重复）
-        for action_cmd in self.action_commands:
-            if (action_cmd.startswith(command_lower) or command_lower in action_cmd) and action_cmd != command_lower:
-                suggestions.append(f"get {action_cmd}")
-        
-        # 检查复合命令前缀
-        for prefix in self.composite_prefixes:
-            if prefix.startswith(command_lower) or command_lower in prefix:
-                suggestions.extend([f"{prefix} balance", f"{prefix} orders", f"{prefix} transfer"])
-        
+        # 近似命令一次批量匹配（C 实现），取代逐集合的 startswith/in 扫描，
+        # 还能抓住前缀启发式漏掉的中段拼写错误
+        for match in _close_matches(command_lower, self._all_commands, n=5, cutoff=0.5):
+            if match == command_lower:
+                continue
+            if match in self.composite_prefixes:
+                suggestions.extend([f"{match} balance", f"{match} orders", f"{match} transfer"])
+            elif match in self.query_commands:
+                suggestions.append(f"check {match}")
+                suggestions.append(f"get {match}")
+            else:
+                suggestions.append(match)
+
         # 去重并限制建议数量
         unique_suggestions = list(dict.fromkeys(suggestions))  # 保持顺序的去重
         
         if unique_suggestions:
-            print(f"{Fore.YELLOW}💡 您可能想要输入:{Style.RESET_ALL}")
+            print(f"{_Y}💡 您可能想要输入:{_RST}")
             for suggestion in unique_suggestions[:5]:  # 最多显示5个建议
                 print(f"   {suggestion}")
         else:
-            print(f"{Fore.YELLOW}💡 输入 'help' 查看所有可用命令{Style.RESET_ALL}")
+            print(f"{_Y}💡 输入 'help' 查看所有可用命令{_RST}")
     
     def _handle_unknown_command(self, command: str, args: str) -> bool:
         """处理未知命令，提供友好的错误信息和建议"""
-        print(f"{Fore.RED}❓ 未知命令: '{command}'{Style.RESET_ALL}")
+        print(f"{_R}❓ 未知命令: '{command}'{_RST}")
         
         if args:
-            print(f"{Fore.RED}❓ 未知的{command}命令: '{args}'{Style.RESET_ALL}")
+            print(f"{_R}❓ 未知的{command}命令: '{args}'{_RST}")
         
         # 提供命令建议
         self._provide_command_suggestions(command)
@@ -345,62 +641,102 @@ class InjectiveCLI:
 
     def clear_screen(self):
         """Clear the terminal screen."""
-        os.system("cls" if os.name == "nt" else "clear")
-
-    def start_animation(self):
-        """Start the animation in a new thread"""
-        self.animation_stop = False
-        # 确保之前的线程已经停止
-        if self.animation_thread and self.animation_thread.is_alive():
-            self.stop_animation()
-        self.animation_thread = threading.Thread(target=self.display_typing_animation)
-        self.animation_thread.daemon = True
-        self.animation_thread.start()
-
-    def stop_animation(self):
-        """Stop the animation and clean up"""
-        if self.animation_thread and self.animation_thread.is_alive():
-            self.animation_stop = True
-            self.animation_thread.join(timeout=1.0)  # Wait for animation to finish
-            self.animation_thread = None
-
-    def display_typing_animation(self):
-        """Display a typing animation while waiting for response."""
-        animation = ["⠋", "⠙", "⠹", "⠸", "⠼", "⠴", "⠦", "⠧", "⠇", "⠏"]
-        i = 0
-        while not self.animation_stop:
-            sys.stdout.write(
-                f"\r{Fore.YELLOW}Processing transaction {animation[i]}{Style.RESET_ALL}"
-            )
-            sys.stdout.flush()
-            time.sleep(0.1)
-            i = (i + 1) % len(animation)
-        # Clear the animation line when done
+        # 直接写 ANSI 清屏序列，免去 os.system 的 fork+exec；
+        # colorama 初始化后 Windows 终端同样可以识别
+        sys.stdout.write("\x1b[2J\x1b[H")
+        sys.stdout.flush()
+
+    @contextmanager
+    def _buffered_out(self):
+        """把多行输出先写进 StringIO，退出时一次 write 刷到终端
+
+        一次系统调用 + 一次 stdout 锁获取取代每行一次，
+        在慢速 TTY / SSH 下尤其明显。
+        """
+        buf = io.StringIO()
+        yield buf
+        sys.stdout.write(buf.getvalue())
+        sys.stdout.flush()
+
+    def _clear_status_line(self):
+        """清除等待动画残留的行"""
         sys.stdout.write("\r" + " " * 50 + "\r")
         sys.stdout.flush()
 
+    def _request_with_spinner(self, endpoint: str, data: dict, agent: Optional[dict] = None) -> dict:
+        """阻塞请求放到守护线程，主线程原地驱动等待动画
+
+        不走线程池：池里的工作线程是非守护线程，解释器退出前会被
+        join，一个挂在 session.post 里的请求能把 Ctrl-C/quit 拖到
+        超时才放行。守护线程随进程退出直接丢弃，结果经单槽队列
+        交回主线程（异常原样带回重抛）。
+        """
+        # 非 TTY（重定向/管道）没人看动画，直接同步请求
+        if not sys.stdout.isatty():
+            return self.make_request(endpoint, data, agent=agent)
+
+        result_q: queue.Queue = queue.Queue(maxsize=1)
+
+        def _worker():
+            try:
+                result_q.put((True, self.make_request(endpoint, data, agent=agent)))
+            except BaseException as e:
+                result_q.put((False, e))
+
+        threading.Thread(target=_worker, daemon=True).start()
+        frames = itertools.cycle(_SPINNER_FRAMES)
+        try:
+            while True:
+                try:
+                    ok, payload = result_q.get(timeout=0.1)
+                except queue.Empty:
+                    sys.stdout.write(next(frames))
+                    sys.stdout.flush()
+                    continue
+                if ok:
+                    return payload
+                raise payload
+        finally:
+            self._clear_status_line()
+
     def _format_network_details(self) -> str:
-        """返回包含实际链信息的网络字符串"""
+        """返回包含实际链信息的网络字符串（按网络名缓存）"""
+        current_net = self.agent_manager.get_current_network()
+        cached = self._net_details.get(current_net)
+        if cached is not None:
+            return cached
         try:
-            current_net = self.agent_manager.get_current_network()
-            inj_net = Network.testnet() if current_net == "testnet" else Network.mainnet()
-            return f"{current_net.upper()} (chain_id: {inj_net.chain_id}, fee_denom: {inj_net.fee_denom})"
+            inj_net = self._networks.get(current_net)
+            if inj_net is None:
+                # 首次使用才加载 pyinjective（依赖树相当大）
+                from pyinjective.core.network import Network
+
+                inj_net = (
+                    Network.testnet() if current_net == "testnet" else Network.mainnet()
+                )
+                self._networks[current_net] = inj_net
+            details = (
+                f"{current_net.upper()} (chain_id: {inj_net.chain_id}, fee_denom: {inj_net.fee_denom})"
+            )
+            self._net_details[current_net] = details
+            return details
         except Exception:
-            return self.agent_manager.get_current_network().upper()
+            return current_net.upper()
 
     def list_agents_by_network(self, agents, environment):
         if not agents and self.agent_manager.current_network == environment:
             print(
-                f"{Fore.YELLOW}No agents configured for {self.agent_manager.get_current_network().upper()}{Style.RESET_ALL}"
+                f"{_Y}No agents configured for {self.agent_manager.get_current_network().upper()}{_RST}"
             )
             return False
         else:
-            print(
-                f"{Fore.CYAN}Available Agents on {self.agent_manager.get_current_network().upper()}:{Style.RESET_ALL}"
-            )
-            for name, info in agents.items():
-                current = "*" if name == self.agent_manager.current_agent else " "
-                print(f"{current} {name}: {info['address']}")
+            with self._buffered_out() as b:
+                b.write(
+                    f"{_C}Available Agents on {self.agent_manager.get_current_network().upper()}:{_RST}\n"
+                )
+                for name, info in agents.items():
+                    current = "*" if name == self.agent_manager.current_agent else " "
+                    b.write(f"{current} {name}: {info['address']}\n")
             return True
 
     def format_response(self, response_text, response_type=None):
@@ -408,46 +744,48 @@ class InjectiveCLI:
         if not response_text:
             return "No response"
 
-        try:
-            # Try to parse as JSON first
-            response_data = (
-                json.loads(response_text)
-                if isinstance(response_text, str)
-                else response_text
-            )
+        # response.json() 已经解析过的 dict 直接分派，跳过重复的 JSON 解析
+        if isinstance(response_text, dict):
+            response_data = response_text
+        elif isinstance(response_text, str):
+            # 绝大多数 AI 回复是纯文本：先看首个非空白字符，不像 JSON
+            # 就直接返回，省掉整段解析 + 异常开销
+            stripped = response_text.lstrip()
+            if not stripped or stripped[0] not in "{[":
+                return response_text
+            try:
+                response_data = orjson.loads(response_text)
+            except orjson.JSONDecodeError:
+                return response_text
+        else:
+            return response_text
 
-            # Determine the type of response based on content
-            if isinstance(response_data, dict):
-                if "balances" in response_data:
-                    return self.format_balance_response(response_data)
-                elif any(
-                    key in response_data for key in ["result", "gas_wanted", "gas_fee"]
-                ):
-                    return self.format_transaction_response(response_data)
-        except:
-            pass
+        # Determine the type of response based on content
+        if isinstance(response_data, dict):
+            keys = response_data.keys()
+            if _BALANCE_KEY in keys:
+                return self.format_balance_response(response_data)
+            elif not _TX_KEYS.isdisjoint(keys):
+                return self.format_transaction_response(response_data)
 
         # Default formatting for regular messages
         return response_text
 
-    def format_transaction_response(self, response):
-        """Format blockchain transaction response."""
-        if isinstance(response, str):
-            try:
-                response = json.loads(response)
-            except:
-                return response
+    def format_transaction_response(self, response: dict) -> str:
+        """Format blockchain transaction response.
 
+        调用方（format_response）已经解码出 dict，这里不再重复解析。
+        """
         if isinstance(response, dict):
             if "error" in response:
                 return (
-                    f"{Fore.RED}Transaction Error: {response['error']}{Style.RESET_ALL}"
+                    f"{_R}Transaction Error: {response['error']}{_RST}"
                 )
 
             result = []
             if "result" in response:
                 tx_result = response["result"]
-                result.append(f"{Fore.GREEN}Transaction Successful{Style.RESET_ALL}")
+                result.append(f"{_G}Transaction Successful{_RST}")
                 if isinstance(tx_result, dict):
                     if "txhash" in tx_result:
                         result.append(f"Transaction Hash: {tx_result['txhash']}")
@@ -463,669 +801,455 @@ class InjectiveCLI:
 
         return str(response)
 
-    def format_balance_response(self, response):
-        """Format balance query response."""
-        if isinstance(response, str):
-            try:
-                response = json.loads(response)
-            except:
-                return response
+    def format_balance_response(self, response: dict) -> str:
+        """Format balance query response.
 
+        调用方（format_response）已经解码出 dict，这里不再重复解析。
+        """
         if isinstance(response, dict):
             if "error" in response:
-                return f"{Fore.RED}Query Error: {response['error']}{Style.RESET_ALL}"
+                return f"{_R}Query Error: {response['error']}{_RST}"
 
             if "balances" in response:
-                result = [f"{Fore.CYAN}Account Balances:{Style.RESET_ALL}"]
+                result = [_BALANCE_HEADER]
                 for token in response["balances"]:
-                    amount = Decimal(token.get("amount", 0)) / Decimal(
-                        10**18
-                    )  # Convert from wei
+                    # Convert from wei：整数 divmod + 零填充切片取 8 位小数，
+                    # 每个条目省掉两个 Decimal 对象和一次高精度除法
+                    whole, frac = divmod(int(token.get("amount", 0)), _WEI)
                     denom = token.get("denom", "UNKNOWN")
-                    result.append(f"- {amount:.8f} {denom}")
+                    result.append(f"- {whole}.{frac:018d}"[:-10] + f" {denom}")
                 return "\n".join(result)
 
         return str(response)
 
     def display_response(self, response_text, debug_info=None):
         """Display the bot's response with proper formatting."""
-        sys.stdout.write("\r" + " " * 50 + "\r")
+        # 整段响应拼成一个缓冲串，单次 write 落到终端
+        out = ["\r" + " " * 50 + "\r"]
 
         if debug_info:
-            print(
-                f"{Fore.YELLOW}Debug: {json.dumps(debug_info, indent=2)}{Style.RESET_ALL}"
+            out.append(
+                f"{_Y}Debug: {orjson.dumps(debug_info, option=orjson.OPT_INDENT_2).decode()}{_RST}\n"
             )
 
         formatted_response = self.format_response(response_text)
-        print(f"{Fore.BLUE}Response: {formatted_response}{Style.RESET_ALL}")
-        print()
+        out.append(f"{_B}Response: {formatted_response}{_RST}\n\n")
+        sys.stdout.write("".join(out))
+        sys.stdout.flush()
 
     def display_banner(self):
         """Display welcome banner with agent information"""
         self.clear_screen()
-        print(f"{Fore.CYAN}=" * 80)
-        print(
-            Fore.BLUE
-            + """
-        ██╗███╗   ██╗     ██╗███████╗ ██████╗████████╗██╗██╗   ██╗███████╗
-        ██║████╗  ██║     ██║██╔════╝██╔════╝╚══██╔══╝██║██║   ██║██╔════╝
-        ██║██╔██╗ ██║     ██║█████╗  ██║        ██║   ██║██║   ██║█████╗  
-        ██║██║╚██╗██║██   ██║██╔══╝  ██║        ██║   ██║╚██╗ ██╔╝██╔══╝  
-        ██║██║ ╚████║╚█████╔╝███████╗╚██████╗   ██║   ██║ ╚████╔╝ ███████╗
-        ╚═╝╚═╝  ╚═══╝ ╚════╝ ╚══════╝ ╚═════╝   ╚═╝   ╚═╝  ╚═══╝  ╚══════╝
-        """
-            + Fore.RESET
-        )
-        print(
-            f"{Back.BLUE}{Fore.WHITE} Injective Chain Interactive Agent CLI Client {Style.RESET_ALL}"
-        )
-        print(f"{Fore.CYAN}Connected to: {self.api_url}")
-        print(f"Session ID: {self.session_id}")
-        print(f"Current Network: {self._format_network_details()}")
+        # 静态部分在 __init__ 预拼好，这里只格式化动态行并单次写出
+        lines = [
+            self._banner_art,
+            f"{_C}Connected to: {self.api_url}",
+            f"Session ID: {self.session_id}",
+            f"Current Network: {self._format_network_details()}",
+        ]
 
         current_agent = self.agent_manager.get_current_agent()
         if current_agent:
-            print(f"Current Agent: {self.agent_manager.current_agent}")
-            print(f"Agent Address: {current_agent['address']}")
+            lines.append(f"Current Agent: {self.agent_manager.current_agent}")
+            lines.append(f"Agent Address: {current_agent['address']}")
         else:
-            print(
-                f"{Fore.YELLOW}No agent selected. Please select an agent{Style.RESET_ALL}"
+            lines.append(
+                f"{_Y}No agent selected. Please select an agent{_RST}"
             )
 
-        print(f"{Fore.CYAN}=" * 80)
-        print(f"{Fore.YELLOW}Available Commands:")
-        print("General: quit, clear, help, history, ping, debug, session")
-        print("Network: switch_network [mainnet|testnet]")
-        print("Agents: create_agent, delete_agent, switch_agent, list_agents")
-        print("Blockchain: check balance, get orders, show markets, view positions, transfer")
-        print("Direct Commands: transfer, balance, orders, markets, positions, history")
-        print("Server: shutdown_server [token]")
-        print("=" * 80 + Style.RESET_ALL)
+        lines.append(self._banner_footer)
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
 
     def handle_agent_commands(self, command: str, args: str) -> bool:
-        """Handle agent-related commands"""
+        """Handle agent-related commands via the O(1) dispatch table"""
         try:
-            if command == "switch_network":
-                if not args or args.lower() not in ["mainnet", "testnet"]:
-                    print(
-                        f"{Fore.RED}Error: Please specify 'mainnet' or 'testnet'{Style.RESET_ALL}"
-                    )
-                    return True
-
-                # Clear current agent when switching networks
-                self.agent_manager.current_agent = None
-                self.agent_manager.switch_network(args.lower())
-                print(f"{Fore.GREEN}Switched to {args.upper()}{Style.RESET_ALL}")
-                self.display_banner()
-                return True
+            handler = self._agent_handlers.get(command)
+            if handler is not None:
+                return handler(args)
 
-            elif command == "create_agent":
-                if not args:
-                    print(f"{Fore.RED}Error: Agent name required{Style.RESET_ALL}")
-                    return True
-                agent_info = self.agent_manager.create_agent(args)
-                print(
-                    f"{Fore.GREEN}Created agent '{args}' on {self.agent_manager.get_current_network().upper()}{Style.RESET_ALL}"
-                )
-                print(f"Address: {agent_info['address']}")
-                return True
+            # 处理复合命令（如 "check balance", "get balance" 等）
+            if command in ("check", "get", "show", "view"):
+                return self._handle_composite_command(command, args)
 
-            elif command == "delete_agent":
-                if not args:
-                    print(f"{Fore.RED}Error: Agent name required{Style.RESET_ALL}")
-                    return True
-                self.agent_manager.delete_agent(args)
-                print(f"{Fore.GREEN}Deleted agent '{args}'{Style.RESET_ALL}")
-                return True
+            return self._cmd_unknown(command)
 
-            elif command == "switch_agent":
-                if not args:
-                    print(f"{Fore.RED}Error: Agent name required{Style.RESET_ALL}")
-                    return True
-                self.agent_manager.switch_agent(args)
-                print(
-                    f"{Fore.GREEN}Switched to agent '{args}' on {self.agent_manager.get_current_network().upper()}{Style.RESET_ALL}"
-                )
-                return True
+        except Exception as e:
+            print(f"{_R}Error: {str(e)}{_RST}")
+            return True
 
-            elif command == "list_agents":
-                # agents = self.agent_manager.list_agents()
-                (
-                    mainnet_agents,
-                    testnet_agents,
-                ) = self.agent_manager.get_agent_based_on_network()
-                if self.agent_manager.current_network == "mainnet":
-                    self.list_agents_by_network(mainnet_agents, "mainnet")
-                else:
-                    self.list_agents_by_network(testnet_agents, "testnet")
-                return True
-                
+    def _cmd_switch_network(self, args: str) -> bool:
+        if not args or args.lower() not in ["mainnet", "testnet"]:
+            print(
+                f"{_R}Error: Please specify 'mainnet' or 'testnet'{_RST}"
+            )
+            return True
 
+        # Clear current agent when switching networks
+        self.agent_manager.current_agent = None
+        self.agent_manager.switch_network(args.lower())
+        self._req_base["environment"] = self.agent_manager.get_current_network()
+        print(f"{_G}Switched to {args.upper()}{_RST}")
+        self.display_banner()
+        return True
 
-            elif command == "shutdown_server":
-                try:
-                    url = f"{self.api_url.rstrip('/')}/shutdown"
-                    headers = {"Content-Type": "application/json", "Accept": "application/json"}
-                    payload = {}
-                    if args:
-                        payload["token"] = args.strip()
-                    print(f"{Fore.YELLOW}Requesting server shutdown...{Style.RESET_ALL}")
-                    resp = requests.post(url, json=payload, headers=headers, timeout=5)
-                    if resp.status_code == 200:
-                        print(f"{Fore.GREEN}✅ Server acknowledged shutdown.{Style.RESET_ALL}")
-                    elif resp.status_code == 403:
-                        print(f"{Fore.RED}❌ Unauthorized. Invalid or missing shutdown token.{Style.RESET_ALL}")
-                    else:
-                        print(f"{Fore.RED}❌ Shutdown failed: HTTP {resp.status_code} - {resp.text}{Style.RESET_ALL}")
-                except Exception as e:
-                    print(f"{Fore.RED}❌ Shutdown request error: {str(e)}{Style.RESET_ALL}")
-                return True
+    def _cmd_create_agent(self, args: str) -> bool:
+        if not args:
+            print(f"{_R}Error: Agent name required{_RST}")
+            return True
+        agent_info = self.agent_manager.create_agent(args)
+        print(
+            f"{_G}Created agent '{args}' on {self.agent_manager.get_current_network().upper()}{_RST}"
+        )
+        print(f"Address: {agent_info['address']}")
+        return True
 
-            elif command == "netcheck":
-                try:
-                    url = f"{self.api_url.rstrip('/')}/network/connectivity"
-                    params = {"environment": self.agent_manager.get_current_network()}
-                    headers = {"Accept": "application/json"}
-                    print(f"{Fore.YELLOW}Checking Injective endpoint connectivity...{Style.RESET_ALL}")
-                    resp = requests.get(url, params=params, headers=headers, timeout=10)
-                    if resp.status_code == 200:
-                        data = resp.json()
-                        fresh = data.get("fresh", {})
-                        print(f"{Fore.GREEN}✅ Connectivity results ({data.get('environment','')}){Style.RESET_ALL}")
-                        for name, item in fresh.items():
-                            ok = 'OK' if item.get('reachable') else 'FAIL'
-                            lat = item.get('latency_ms')
-                            target = item.get('target')
-                            print(f"  - {name:14s} {ok:4s}  {lat:>6} ms  {target}")
-                    else:
-                        print(f"{Fore.RED}❌ Netcheck failed: HTTP {resp.status_code} - {resp.text}{Style.RESET_ALL}")
-                except Exception as e:
-                    print(f"{Fore.RED}❌ Netcheck error: {str(e)}{Style.RESET_ALL}")
-                return True
-                
-            # 处理复合命令（如 "check balance", "get balance" 等）
-            elif command in ["check", "get", "show", "view"]:
-                return self._handle_composite_command(command, args)
-                
+    def _cmd_delete_agent(self, args: str) -> bool:
+        if not args:
+            print(f"{_R}Error: Agent name required{_RST}")
+            return True
+        self.agent_manager.delete_agent(args)
+        print(f"{_G}Deleted agent '{args}'{_RST}")
+        return True
+
+    def _cmd_switch_agent(self, args: str) -> bool:
+        if not args:
+            print(f"{_R}Error: Agent name required{_RST}")
+            return True
+        self.agent_manager.switch_agent(args)
+        print(
+            f"{_G}Switched to agent '{args}' on {self.agent_manager.get_current_network().upper()}{_RST}"
+        )
+        # 换代理后大概率紧接着查余额/持仓：后台预取填充查询缓存
+        self._prefetch_agent_queries()
+        return True
+
+    def _prefetch_agent_queries(self):
+        """在线程池里预取余额和持仓，让随后的手动查询直接命中缓存"""
+        for fut in self._warm_futures:
+            fut.cancel()
+        current_agent = self.agent_manager.get_current_agent()
+        if not current_agent:
+            return
+        self._warm_futures = [
+            self._executor.submit(self._prefetch_one, message, current_agent)
+            for message in ("check balance", "check positions")
+        ]
+
+    def _prefetch_one(self, message: str, agent: dict):
+        try:
+            request_data = {
+                **self._req_base,
+                "message": message,
+                "agent_id": agent.get('address'),
+                "agent_key": agent.get('private_key'),
+            }
+            self.make_request("/chat", request_data, agent=agent, cacheable=True)
+        except Exception:
+            # 预取失败不打扰用户；真正的查询会正常报告错误
+            pass
+
+    def _cmd_list_agents(self, args: str) -> bool:
+        (
+            mainnet_agents,
+            testnet_agents,
+        ) = self.agent_manager.get_agent_based_on_network()
+        if self.agent_manager.current_network == "mainnet":
+            self.list_agents_by_network(mainnet_agents, "mainnet")
+        else:
+            self.list_agents_by_network(testnet_agents, "testnet")
+        return True
+
+    def _cmd_shutdown_server(self, args: str) -> bool:
+        try:
+            url = f"{self.api_url}/shutdown"
+            payload = {}
+            if args:
+                payload["token"] = args.strip()
+            print(f"{_Y}Requesting server shutdown...{_RST}")
+            resp = self.session.post(url, json=payload, timeout=5)
+            if resp.status_code == 200:
+                print(f"{_G}✅ Server acknowledged shutdown.{_RST}")
+            elif resp.status_code == 403:
+                print(f"{_R}❌ Unauthorized. Invalid or missing shutdown token.{_RST}")
             else:
-                # 检查是否是拼写错误
-                known_commands = ["switch_network", "create_agent", "delete_agent", "switch_agent", "list_agents", "shutdown_server", "netcheck", "check", "get", "show", "view"]
-                suggestions = []
-                
-                for known_cmd in known_commands:
-                    if self._similarity(command, known_cmd) > 0.6:  # 相似度阈值
-                        suggestions.append(known_cmd)
-                
-                if suggestions:
-                    print(f"{Fore.YELLOW}❓ 未知命令: '{command}'{Style.RESET_ALL}")
-                    print(f"{Fore.CYAN}💡 您可能想要输入: {', '.join(suggestions)}{Style.RESET_ALL}")
-                    print(f"{Fore.CYAN}💡 输入 'help' 查看所有可用命令{Style.RESET_ALL}")
-                else:
-                    print(f"{Fore.CYAN}❓ 未知命令: '{command}'{Style.RESET_ALL}")
-                    print(f"{Fore.CYAN}💡 输入 'help' 查看所有可用命令{Style.RESET_ALL}")
-                
-                # 如果没有选中的代理，直接返回
-                if not self.agent_manager.get_current_agent():
-                    return True
+                print(f"{_R}❌ Shutdown failed: HTTP {resp.status_code} - {resp.text}{_RST}")
+        except Exception as e:
+            print(f"{_R}❌ Shutdown request error: {str(e)}{_RST}")
+        return True
 
+    def _cmd_netcheck(self, args: str) -> bool:
+        try:
+            url = f"{self.api_url}/network/connectivity"
+            params = {"environment": self.agent_manager.get_current_network()}
+            print(f"{_Y}Checking Injective endpoint connectivity...{_RST}")
+            resp = self.session.get(url, params=params, timeout=10)
+            if resp.status_code == 200:
+                data = resp.json()
+                fresh = data.get("fresh", {})
+                with self._buffered_out() as b:
+                    b.write(f"{_G}✅ Connectivity results ({data.get('environment','')}){_RST}\n")
+                    for name, item in fresh.items():
+                        reachable, lat, target = _NC_GET(item)
+                        ok = 'OK' if reachable else 'FAIL'
+                        b.write(f"  - {name:14s} {ok:4s}  {lat:>6} ms  {target}\n")
+            else:
+                print(f"{_R}❌ Netcheck failed: HTTP {resp.status_code} - {resp.text}{_RST}")
         except Exception as e:
-            print(f"{Fore.RED}Error: {str(e)}{Style.RESET_ALL}")
+            print(f"{_R}❌ Netcheck error: {str(e)}{_RST}")
+        return True
+
+    def _cmd_unknown(self, command: str) -> bool:
+        # 检查是否是拼写错误；候选直接取自分发表键，避免重复维护命令列表
+        known_commands = list(self._agent_handlers) + ["check", "get", "show", "view"]
+        suggestions = _close_matches(command, known_commands)
+
+        if suggestions:
+            print(f"{_Y}❓ 未知命令: '{command}'{_RST}")
+            print(f"{_C}💡 您可能想要输入: {', '.join(suggestions)}{_RST}")
+            print(f"{_C}💡 输入 'help' 查看所有可用命令{_RST}")
+        else:
+            print(f"{_C}❓ 未知命令: '{command}'{_RST}")
+            print(f"{_C}💡 输入 'help' 查看所有可用命令{_RST}")
+
+        # 如果没有选中的代理，直接返回
+        if not self.agent_manager.get_current_agent():
             return True
 
         return False
     
-    def _similarity(self, s1: str, s2: str) -> float:
-        """计算两个字符串的相似度（简单的编辑距离）"""
-        if s1 == s2:
-            return 1.0
-        
-        # 简单的相似度计算
-        if len(s1) < len(s2):
-            s1, s2 = s2, s1
-        
-        if len(s2) == 0:
-            return 0.0
-        
-        # 计算公共字符数
-        common_chars = sum(1 for c in s2 if c in s1)
-        return common_chars / len(s2)
-    
     def _get_session_duration(self) -> str:
-        """计算会话运行时长"""
+        """计算会话运行时长（1 秒内的连续调用直接复用上次结果）"""
+        now = time.monotonic()
+        cached_at, cached = self._dur_cache
+        if now - cached_at < 1.0:
+            return cached
+
         duration = datetime.now() - self.session_start_time
         total_seconds = int(duration.total_seconds())
-        
+
         if total_seconds < 60:
-            return f"{total_seconds}秒"
+            result = f"{total_seconds}秒"
         elif total_seconds < 3600:
             minutes = total_seconds // 60
             seconds = total_seconds % 60
-            return f"{minutes}分{seconds}秒"
+            result = f"{minutes}分{seconds}秒"
         else:
             hours = total_seconds // 3600
             minutes = (total_seconds % 3600) // 60
-            return f"{hours}小时{minutes}分"
+            result = f"{hours}小时{minutes}分"
+
+        self._dur_cache = (now, result)
+        return result
     
     def _add_to_history(self, command: str):
         """添加命令到历史记录"""
         if command.strip() and command not in ["", "clear", "help"]:
+            # deque(maxlen=50) 写满后自动淘汰最旧记录
             self.command_history.append(command)
-            # 保持历史记录在合理范围内
-            if len(self.command_history) > 50:
-                self.command_history.pop(0)
     
     def _handle_composite_command(self, command: str, args: str) -> bool:
         """处理复合命令（如 check balance, get balance 等）"""
         if not args:
-            print(f"{Fore.YELLOW}💡 请指定要{command}的内容{Style.RESET_ALL}")
+            print(f"{_Y}💡 请指定要{command}的内容{_RST}")
             print(f"   例如: {command} balance, {command} orders, {command} markets, {command} transfer")
             return True
         
-        # 解析子命令
+        # 解析子命令并查表分发
         sub_command = args.lower().strip()
-        
-        if sub_command in ["balance", "balances", "bal"]:
-            return self._handle_balance_command(command)
-        elif sub_command in ["order", "orders", "orderbook"]:
-            return self._handle_orders_command(command)
-        elif sub_command in ["market", "markets", "ticker"]:
-            return self._handle_markets_command(command)
-        elif sub_command in ["position", "positions", "pos"]:
-            return self._handle_positions_command(command)
-        elif sub_command in ["history", "hist", "transactions"]:
-            return self._handle_history_command(command)
-        elif sub_command in ["transfer", "send", "tx"]:
-            return self._handle_transfer_command(command)
-        else:
-            print(f"{Fore.YELLOW}❓ 未知的{command}命令: '{sub_command}'{Style.RESET_ALL}")
-            print(f"{Fore.CYAN}💡 支持的{command}命令: balance, orders, markets, positions, history, transfer{Style.RESET_ALL}")
-            return True
+
+        handler = self._composite_dispatch.get(sub_command)
+        if handler is not None:
+            return handler(command)
+
+        print(f"{_Y}❓ 未知的{command}命令: '{sub_command}'{_RST}")
+        print(f"{_C}💡 支持的{command}命令: balance, orders, markets, positions, history, transfer{_RST}")
+        return True
     
     def _handle_direct_command(self, command: str, args: str) -> bool:
-        """处理直接命令（如 transfer, balance 等，无需复合格式）"""
-        command_lower = command.lower()
-        
-        if command_lower in ["transfer", "send", "tx"]:
+        """处理直接命令（如 transfer, balance 等；路由器已转小写）"""
+        if command in ("transfer", "send", "tx"):
             # 如果已经有参数，直接处理；否则进入交互模式
             if args:
                 return self._handle_transfer_with_args(args)
-            else:
-                return self._handle_transfer_command(command)
-        elif command_lower in ["balance", "balances", "bal"]:
-            return self._handle_balance_command(command)
-        elif command_lower in ["order", "orders", "orderbook"]:
-            return self._handle_orders_command(command)
-        elif command_lower in ["market", "markets", "ticker"]:
-            return self._handle_markets_command(command)
-        elif command_lower in ["position", "positions", "pos"]:
-            return self._handle_positions_command(command)
-        elif command_lower in ["history", "hist", "transactions"]:
-            return self._handle_history_command(command)
-        else:
-            return False
+            return self._handle_transfer_command(command)
+
+        handler = self._composite_dispatch.get(command)
+        if handler is not None:
+            return handler(command)
+        return False
     
-    def _handle_balance_command(self, command: str) -> bool:
-        """处理余额查询命令"""
+    def _do_agent_query(self, message: str, action_title: str, result_title: str) -> bool:
+        """统一的查询处理：五个查询命令只差消息文案，共用一条热路径"""
         current_agent = self.agent_manager.get_current_agent()
         if not current_agent:
-            print(f"{Fore.RED}❌ 请先选择代理{Style.RESET_ALL}")
+            print(f"{_R}❌ 请先选择代理{_RST}")
             print(f"   使用 'switch_agent' 命令选择代理")
             return True
-        
-        print(f"{Fore.CYAN}💰 查询余额...{Style.RESET_ALL}")
+
+        print(f"{_C}{action_title}{_RST}")
         print(f"   代理地址: {current_agent.get('address', 'unknown')}")
         print(f"   网络: {self._format_network_details()}")
-        
-        # 调用区块链API查询余额
+
         try:
-            # 构建请求数据
             request_data = {
-                "message": "check balance",
-                "session_id": self.session_id,
+                **self._req_base,
+                "message": message,
                 "agent_id": current_agent.get('address'),
                 "agent_key": current_agent.get('private_key'),
-                "environment": self.agent_manager.get_current_network()
             }
-            
-            # 发送请求到服务器
-            response = self.make_request("/chat", request_data)
-            
+
+            # 纯读查询：60 秒内重复同一条查询直接吃缓存
+            response = self.make_request(
+                "/chat", request_data, agent=current_agent, cacheable=True
+            )
+
             if response and "response" in response:
-                print(f"\n{Fore.GREEN}✅ 余额查询结果:{Style.RESET_ALL}")
+                print(f"\n{_G}{result_title}{_RST}")
                 self.display_response(response.get("response"), response if self.debug else None)
                 # 非调试模式下，也简要显示函数调用信息
                 if "function_call" in response and response["function_call"] and not self.debug:
                     fc = response["function_call"]
                     fname = fc.get("name", "unknown")
                     fresult = fc.get("result", {})
-                    status = fresult.get("success")
+                    status = fresult.get("success") if isinstance(fresult, dict) else None
                     print(f"   函数调用: {fname} -> {'成功' if status else '失败'}")
                     if isinstance(fresult, dict) and not status and fresult.get("error"):
                         print(f"   错误: {fresult.get('error')}")
             else:
-                print(f"{Fore.RED}❌ 查询失败: 服务器无响应{Style.RESET_ALL}")
-                
+                print(f"{_R}❌ 查询失败: 服务器无响应{_RST}")
+
         except Exception as e:
-            print(f"{Fore.RED}❌ 查询失败: {str(e)}{Style.RESET_ALL}")
+            print(f"{_R}❌ 查询失败: {str(e)}{_RST}")
             print(f"   请确保服务器正在运行并且代理配置正确")
-        
+
         return True
-    
+
+    def _handle_balance_command(self, command: str) -> bool:
+        """处理余额查询命令"""
+        return self._do_agent_query("check balance", "💰 查询余额...", "✅ 余额查询结果:")
+
     def _handle_orders_command(self, command: str) -> bool:
         """处理订单查询命令"""
-        current_agent = self.agent_manager.get_current_agent()
-        if not current_agent:
-            print(f"{Fore.RED}❌ 请先选择代理{Style.RESET_ALL}")
-            print(f"   使用 'switch_agent' 命令选择代理")
-            return True
-        
-        print(f"{Fore.CYAN}📋 查询订单...{Style.RESET_ALL}")
-        print(f"   代理地址: {current_agent.get('address', 'unknown')}")
-        print(f"   网络: {self._format_network_details()}")
-        
-        try:
-            request_data = {
-                "message": "check orders",
-                "session_id": self.session_id,
-                "agent_id": current_agent.get('address'),
-                "agent_key": current_agent.get('private_key'),
-                "environment": self.agent_manager.get_current_network()
-            }
-            
-            response = self.make_request("/chat", request_data)
-            
-            if response and "response" in response:
-                print(f"\n{Fore.GREEN}✅ 订单查询结果:{Style.RESET_ALL}")
-                self.display_response(response.get("response"), response if self.debug else None)
-                if "function_call" in response and response["function_call"] and not self.debug:
-                    fc = response["function_call"]
-                    fname = fc.get("name", "unknown")
-                    print(f"   函数调用: {fname}")
-            else:
-                print(f"{Fore.RED}❌ 查询失败: 服务器无响应{Style.RESET_ALL}")
-                
-        except Exception as e:
-            print(f"{Fore.RED}❌ 查询失败: {str(e)}{Style.RESET_ALL}")
-        
-        return True
-    
+        return self._do_agent_query("check orders", "📋 查询订单...", "✅ 订单查询结果:")
+
     def _handle_markets_command(self, command: str) -> bool:
         """处理市场查询命令"""
-        current_agent = self.agent_manager.get_current_agent()
-        if not current_agent:
-            print(f"{Fore.RED}❌ 请先选择代理{Style.RESET_ALL}")
-            print(f"   使用 'switch_agent' 命令选择代理")
-            return True
-        
-        print(f"{Fore.CYAN}📊 查询市场数据...{Style.RESET_ALL}")
-        print(f"   代理地址: {current_agent.get('address', 'unknown')}")
-        print(f"   网络: {self._format_network_details()}")
-        
-        try:
-            request_data = {
-                "message": "show markets",
-                "session_id": self.session_id,
-                "agent_id": current_agent.get('address'),
-                "agent_key": current_agent.get('private_key'),
-                "environment": self.agent_manager.get_current_network()
-            }
-            
-            response = self.make_request("/chat", request_data)
-            
-            if response and "response" in response:
-                print(f"\n{Fore.GREEN}✅ 市场数据查询结果:{Style.RESET_ALL}")
-                self.display_response(response.get("response"), response if self.debug else None)
-                if "function_call" in response and response["function_call"] and not self.debug:
-                    fc = response["function_call"]
-                    fname = fc.get("name", "unknown")
-                    print(f"   函数调用: {fname}")
-            else:
-                print(f"{Fore.RED}❌ 查询失败: 服务器无响应{Style.RESET_ALL}")
-                
-        except Exception as e:
-            print(f"{Fore.RED}❌ 查询失败: {str(e)}{Style.RESET_ALL}")
-        
-        return True
-    
+        return self._do_agent_query("show markets", "📊 查询市场数据...", "✅ 市场数据查询结果:")
+
     def _handle_positions_command(self, command: str) -> bool:
         """处理持仓查询命令"""
-        current_agent = self.agent_manager.get_current_agent()
-        if not current_agent:
-            print(f"{Fore.RED}❌ 请先选择代理{Style.RESET_ALL}")
-            print(f"   使用 'switch_agent' 命令选择代理")
-            return True
-        
-        print(f"{Fore.CYAN}📈 查询持仓...{Style.RESET_ALL}")
-        print(f"   代理地址: {current_agent.get('address', 'unknown')}")
-        print(f"   网络: {self._format_network_details()}")
-        
-        try:
-            request_data = {
-                "message": "check positions",
-                "session_id": self.session_id,
-                "agent_id": current_agent.get('address'),
-                "agent_key": current_agent.get('private_key'),
-                "environment": self.agent_manager.get_current_network()
-            }
-            
-            response = self.make_request("/chat", request_data)
-            
-            if response and "response" in response:
-                print(f"\n{Fore.GREEN}✅ 持仓查询结果:{Style.RESET_ALL}")
-                self.display_response(response.get("response"), response if self.debug else None)
-                if "function_call" in response and response["function_call"] and not self.debug:
-                    fc = response["function_call"]
-                    fname = fc.get("name", "unknown")
-                    print(f"   函数调用: {fname}")
-            else:
-                print(f"{Fore.RED}❌ 查询失败: 服务器无响应{Style.RESET_ALL}")
-                
-        except Exception as e:
-            print(f"{Fore.RED}❌ 查询失败: {str(e)}{Style.RESET_ALL}")
-        
-        return True
-    
+        return self._do_agent_query("check positions", "📈 查询持仓...", "✅ 持仓查询结果:")
+
     def _handle_history_command(self, command: str) -> bool:
         """处理历史记录查询命令"""
-        current_agent = self.agent_manager.get_current_agent()
-        if not current_agent:
-            print(f"{Fore.RED}❌ 请先选择代理{Style.RESET_ALL}")
-            print(f"   使用 'switch_agent' 命令选择代理")
-            return True
-        
-        print(f"{Fore.CYAN}📜 查询交易历史...{Style.RESET_ALL}")
-        print(f"   代理地址: {current_agent.get('address', 'unknown')}")
-        print(f"   网络: {self._format_network_details()}")
-        
-        try:
-            request_data = {
-                "message": "check history",
-                "session_id": self.session_id,
-                "agent_id": current_agent.get('address'),
-                "agent_key": current_agent.get('private_key'),
-                "environment": self.agent_manager.get_current_network()
-            }
-            
-            response = self.make_request("/chat", request_data)
-            
-            if response and "response" in response:
-                print(f"\n{Fore.GREEN}✅ 交易历史查询结果:{Style.RESET_ALL}")
-                self.display_response(response.get("response"), response if self.debug else None)
-                if "function_call" in response and response["function_call"] and not self.debug:
-                    fc = response["function_call"]
-                    fname = fc.get("name", "unknown")
-                    print(f"   函数调用: {fname}")
-            else:
-                print(f"{Fore.RED}❌ 查询失败: 服务器无响应{Style.RESET_ALL}")
-                
-        except Exception as e:
-            print(f"{Fore.RED}❌ 查询失败: {str(e)}{Style.RESET_ALL}")
-        
-        return True
+        return self._do_agent_query("check history", "📜 查询交易历史...", "✅ 交易历史查询结果:")
+
+    def _handle_dashboard_command(self, command: str) -> bool:
+        """处理汇总查询命令：四项状态查询合并为一次 /chat 往返"""
+        return self._do_agent_query(
+            "check balance, open orders, positions and recent transaction history",
+            "📊 汇总查询（余额/订单/持仓/历史）...",
+            "✅ 汇总查询结果:",
+        )
 
     def _handle_transfer_with_args(self, args: str) -> bool:
         """处理带参数的转账命令（如 transfer 0.0066 INJ to inj1m9wzsyx0ksaauj0a59gmzlnnyzyakawh3aa5xw）"""
-        current_agent = self.agent_manager.get_current_agent()
-        if not current_agent:
-            print(f"{Fore.RED}❌ 请先选择代理{Style.RESET_ALL}")
+        return self._do_transfer(args)
+
+    def _handle_transfer_command(self, command: str) -> bool:
+        """处理转账命令（交互模式）：提示输入后走统一转账管线"""
+        if not self.agent_manager.get_current_agent():
+            print(f"{_R}❌ 请先选择代理{_RST}")
             print(f"   使用 'switch_agent' 命令选择代理")
             return True
-        
-        print(f"{Fore.CYAN}💰 发起转账...{Style.RESET_ALL}")
-        print(f"   代理地址: {current_agent.get('address', 'unknown')}")
-        print(f"   网络: {self._format_network_details()}")
-        
-        try:
-            # 直接解析转账参数
-            amount, denom, receiver_address = self._parse_transfer_input(args)
-            if not all([amount, denom, receiver_address]):
-                print(f"{Fore.RED}❌ 无法解析转账信息，请使用正确格式{Style.RESET_ALL}")
-                print(f"{Fore.YELLOW}💡 支持的格式:{Style.RESET_ALL}")
-                print(f"   • 金额 代币 to 地址")
-                print(f"   • transfer 金额 代币 to 地址")
-                print(f"   • 完整命令: transfer 0.066 INJ to inj1m9wzsyx0ksaauj0a59gmzlnnyzyakawh3aa5xw")
-                return True
-            
-            print(f"{Fore.GREEN}📋 转账信息确认:{Style.RESET_ALL}")
-            print(f"   接收地址: {receiver_address}")
-            print(f"   转账金额: {amount} {denom}")
-            print(f"   发送地址: {current_agent.get('address', 'unknown')}")
-            
-            # 确认转账
-            print(f"{Fore.YELLOW}确认执行转账? (y/N):{Style.RESET_ALL}")
-            confirm = input().strip().lower()
-            if confirm not in ['y', 'yes']:
-                print(f"{Fore.YELLOW}转账已取消{Style.RESET_ALL}")
-                return True
-            
-            # 按照 bank_schema.json 构建参数
-            from decimal import Decimal
-            amount_decimal = Decimal(str(amount))
-            
-            # 构建符合 schema 的请求数据
-            transfer_params = {
-                "to_address": receiver_address,
-                "amount": str(amount_decimal),  # 按照 schema 要求，使用字符串格式
-                "denom": denom
-            }
-            
-            print(f"{Fore.CYAN}📋 转账参数 (符合 bank_schema.json):{Style.RESET_ALL}")
-            for key, value in transfer_params.items():
-                print(f"   {key}: {value}")
-            
-            # 构建请求数据 - 使用结构化参数而不是自然语言
-            request_data = {
-                "message": "transfer_funds",  # 直接指定函数名
-                "session_id": self.session_id,
-                "agent_id": current_agent.get('address'),
-                "agent_key": current_agent.get('private_key'),
-                "environment": self.agent_manager.get_current_network(),
-                "function_name": "transfer_funds",  # 明确指定函数
-                "function_args": transfer_params  # 传递结构化参数
-            }
-            
-            # 发送请求到服务器
-            print(f"{Fore.CYAN}🚀 正在执行转账...{Style.RESET_ALL}")
-            response = self.make_request("/chat", request_data)
-            
-            if response and "response" in response:
-                print(f"\n{Fore.GREEN}✅ 转账结果:{Style.RESET_ALL}")
-                self.display_response(response.get("response"), response if self.debug else None)
-                if "function_call" in response and response["function_call"] and not self.debug:
-                    fc = response["function_call"]
-                    fname = fc.get("name", "unknown")
-                    fresult = fc.get("result", {})
-                    status = fresult.get("success") if isinstance(fresult, dict) else None
-                    print(f"   函数调用: {fname} -> {'成功' if status else '处理中'}")
-                    if isinstance(fresult, dict) and not status and fresult.get("error"):
-                        print(f"   错误: {fresult.get('error')}")
-            else:
-                print(f"{Fore.RED}❌ 转账失败: 服务器无响应{Style.RESET_ALL}")
-                
-        except Exception as e:
-            print(f"{Fore.RED}❌ 转账失败: {str(e)}{Style.RESET_ALL}")
-            print(f"   请确保服务器正在运行并且代理配置正确")
-        
-        return True
 
-    def _handle_transfer_command(self, command: str) -> bool:
-        """处理转账命令（交互模式）"""
+        print(f"{_Y}请输入转账信息 (格式: 金额 代币 to 地址 或直接输入完整命令){_RST}")
+        print(f"{_C}示例: 0.066 INJ to inj1m9wzsyx0ksaauj0a59gmzlnnyzyakawh3aa5xw{_RST}")
+        print(f"{_C}或者: transfer 0.066 INJ to inj1m9wzsyx0ksaauj0a59gmzlnnyzyakawh3aa5xw{_RST}")
+
+        transfer_input = input().strip()
+        if not transfer_input:
+            print(f"{_R}❌ 转账信息不能为空{_RST}")
+            return True
+        return self._do_transfer(transfer_input)
+
+    def _do_transfer(self, transfer_input: str) -> bool:
+        """统一的转账管线：解析 → 确认 → 构造参数 → 发请求 → 渲染结果
+
+        带参数与交互两个入口此前各维护一份几乎相同的流程，
+        schema 相关的请求构造只保留这一份。
+        """
         current_agent = self.agent_manager.get_current_agent()
         if not current_agent:
-            print(f"{Fore.RED}❌ 请先选择代理{Style.RESET_ALL}")
+            print(f"{_R}❌ 请先选择代理{_RST}")
             print(f"   使用 'switch_agent' 命令选择代理")
             return True
-        
-        print(f"{Fore.CYAN}💰 发起转账...{Style.RESET_ALL}")
+
+        print(f"{_C}💰 发起转账...{_RST}")
         print(f"   代理地址: {current_agent.get('address', 'unknown')}")
         print(f"   网络: {self._format_network_details()}")
-        
+
         try:
-            # 获取转账参数
-            print(f"{Fore.YELLOW}请输入转账信息 (格式: 金额 代币 to 地址 或直接输入完整命令){Style.RESET_ALL}")
-            print(f"{Fore.CYAN}示例: 0.066 INJ to inj1m9wzsyx0ksaauj0a59gmzlnnyzyakawh3aa5xw{Style.RESET_ALL}")
-            print(f"{Fore.CYAN}或者: transfer 0.066 INJ to inj1m9wzsyx0ksaauj0a59gmzlnnyzyakawh3aa5xw{Style.RESET_ALL}")
-            
-            transfer_input = input().strip()
-            if not transfer_input:
-                print(f"{Fore.RED}❌ 转账信息不能为空{Style.RESET_ALL}")
-                return True
-            
-            # 尝试解析转账信息
             amount, denom, receiver_address = self._parse_transfer_input(transfer_input)
             if not all([amount, denom, receiver_address]):
-                print(f"{Fore.RED}❌ 无法解析转账信息，请使用正确格式{Style.RESET_ALL}")
-                print(f"{Fore.YELLOW}💡 支持的格式:{Style.RESET_ALL}")
+                print(f"{_R}❌ 无法解析转账信息，请使用正确格式{_RST}")
+                print(f"{_Y}💡 支持的格式:{_RST}")
                 print(f"   • 金额 代币 to 地址")
                 print(f"   • transfer 金额 代币 to 地址")
                 print(f"   • 完整命令: transfer 0.066 INJ to inj1m9wzsyx0ksaauj0a59gmzlnnyzyakawh3aa5xw")
                 return True
-            
-            print(f"{Fore.GREEN}📋 转账信息确认:{Style.RESET_ALL}")
+
+            print(f"{_G}📋 转账信息确认:{_RST}")
             print(f"   接收地址: {receiver_address}")
             print(f"   转账金额: {amount} {denom}")
             print(f"   发送地址: {current_agent.get('address', 'unknown')}")
-            
+
             # 确认转账
-            print(f"{Fore.YELLOW}确认执行转账? (y/N):{Style.RESET_ALL}")
+            print(f"{_Y}确认执行转账? (y/N):{_RST}")
             confirm = input().strip().lower()
             if confirm not in ['y', 'yes']:
-                print(f"{Fore.YELLOW}转账已取消{Style.RESET_ALL}")
+                print(f"{_Y}转账已取消{_RST}")
                 return True
-            
+
             # 按照 bank_schema.json 构建参数
             # 注意：amount 需要转换为 Decimal 字符串以保持精度
             from decimal import Decimal
             amount_decimal = Decimal(str(amount))
-            
+
             # 构建符合 schema 的请求数据
             transfer_params = {
                 "to_address": receiver_address,
                 "amount": str(amount_decimal),  # 按照 schema 要求，使用字符串格式
                 "denom": denom
             }
-            
-            print(f"{Fore.CYAN}📋 转账参数 (符合 bank_schema.json):{Style.RESET_ALL}")
+
+            print(f"{_C}📋 转账参数 (符合 bank_schema.json):{_RST}")
             for key, value in transfer_params.items():
                 print(f"   {key}: {value}")
-            
+
             # 构建请求数据 - 使用结构化参数而不是自然语言
             request_data = {
+                **self._req_base,
                 "message": "transfer_funds",  # 直接指定函数名
-                "session_id": self.session_id,
                 "agent_id": current_agent.get('address'),
                 "agent_key": current_agent.get('private_key'),
-                "environment": self.agent_manager.get_current_network(),
                 "function_name": "transfer_funds",  # 明确指定函数
                 "function_args": transfer_params  # 传递结构化参数
             }
-            
+
             # 发送请求到服务器
-            print(f"{Fore.CYAN}🚀 正在执行转账...{Style.RESET_ALL}")
-            response = self.make_request("/chat", request_data)
-            
+            print(f"{_C}🚀 正在执行转账...{_RST}")
+            try:
+                response = self.make_request("/chat", request_data, agent=current_agent)
+            finally:
+                # 转账会改变链上状态，把只读查询缓存整体作废。放在
+                # finally：超时/断连时服务端可能已经执行了转账，
+                # 失败也清比留着转账前的旧快照保险
+                self._resp_cache.clear()
+
             if response and "response" in response:
-                print(f"\n{Fore.GREEN}✅ 转账结果:{Style.RESET_ALL}")
+                print(f"\n{_G}✅ 转账结果:{_RST}")
                 self.display_response(response.get("response"), response if self.debug else None)
                 if "function_call" in response and response["function_call"] and not self.debug:
                     fc = response["function_call"]
@@ -1136,129 +1260,188 @@ class InjectiveCLI:
                     if isinstance(fresult, dict) and not status and fresult.get("error"):
                         print(f"   错误: {fresult.get('error')}")
             else:
-                print(f"{Fore.RED}❌ 转账失败: 服务器无响应{Style.RESET_ALL}")
-                
+                print(f"{_R}❌ 转账失败: 服务器无响应{_RST}")
+
         except Exception as e:
-            print(f"{Fore.RED}❌ 转账失败: {str(e)}{Style.RESET_ALL}")
-        
+            print(f"{_R}❌ 转账失败: {str(e)}{_RST}")
+            print(f"   请确保服务器正在运行并且代理配置正确")
+
         return True
-    
+
     def _parse_transfer_input(self, transfer_input: str) -> tuple:
-        """解析转账输入，返回 (amount, denom, receiver_address)"""
-        try:
-            # 移除多余的空格
-            input_clean = ' '.join(transfer_input.split())
-            
-            # 尝试解析 "金额 代币 to 地址" 格式
-            if ' to ' in input_clean:
-                parts = input_clean.split(' to ')
-                if len(parts) == 2:
-                    left_part = parts[0].strip()
-                    receiver_address = parts[1].strip()
-                    
-                    # 解析左侧部分：金额 代币
-                    left_parts = left_part.split()
-                    if len(left_parts) >= 2:
-                        # 尝试解析金额（可能是第一个或最后一个数字）
-                        amount = None
-                        denom = None
-                        
-                        # 检查第一个部分是否为数字
-                        try:
-                            amount = float(left_parts[0])
-                            denom = left_parts[1]
-                        except ValueError:
-                            # 如果第一个不是数字，尝试最后一个
-                            try:
-                                amount = float(left_parts[-2])
-                                denom = left_parts[-1]
-                            except (ValueError, IndexError):
-                                pass
-                        
-                        if amount is not None and denom:
-                            return amount, denom, receiver_address
-            
-            # 尝试解析 "transfer 金额 代币 to 地址" 格式
-            if input_clean.lower().startswith('transfer '):
-                # 移除 "transfer " 前缀
-                content = input_clean[9:].strip()
-                if ' to ' in content:
-                    parts = content.split(' to ')
-                    if len(parts) == 2:
-                        left_part = parts[0].strip()
-                        receiver_address = parts[1].strip()
-                        
-                        left_parts = left_part.split()
-                        if len(left_parts) >= 2:
-                            try:
-                                amount = float(left_parts[0])
-                                denom = left_parts[1]
-                                return amount, denom, receiver_address
-                            except ValueError:
-                                pass
-            
-            # 尝试解析 "send 金额 代币 to 地址" 格式
-            if input_clean.lower().startswith('send '):
-                content = input_clean[5:].strip()
-                if ' to ' in content:
-                    parts = content.split(' to ')
-                    if len(parts) == 2:
-                        left_part = parts[0].strip()
-                        receiver_address = parts[1].strip()
-                        
-                        left_parts = left_part.split()
-                        if len(left_parts) >= 2:
-                            try:
-                                amount = float(left_parts[0])
-                                denom = left_parts[1]
-                                return amount, denom, receiver_address
-                            except ValueError:
-                                pass
-            
-            # 如果无法解析，返回 None
-            return None, None, None
-            
-        except Exception:
+        """解析转账输入，返回 (amount, denom, receiver_address)
+
+        预编译正则一次匹配三种写法（可选 transfer/send 前缀、
+        金额 代币 to 地址），取代原来三段近似重复的 split/float 探测。
+        """
+        m = _TRANSFER_RE.match(transfer_input)
+        if m is None:
             return None, None, None
+        return float(m.group(1)), m.group(2), m.group(3)
 
     def make_request(
-        self, endpoint: str, data: Optional[dict] = None, params: Optional[dict] = None
+        self,
+        endpoint: str,
+        data: Optional[dict] = None,
+        params: Optional[dict] = None,
+        agent: Optional[dict] = None,
+        net: Optional[str] = None,
+        cacheable: bool = False,
     ) -> dict:
-        """Make API request with current agent information"""
+        """Make API request with current agent information
+
+        Callers that already hold the current agent/network snapshot can pass
+        them via `agent`/`net` to avoid re-querying the agent manager.
+        Read-only queries may pass `cacheable=True` to reuse a recent
+        identical response instead of paying another round-trip.
+        """
+        import requests
+
         try:
-            url = f"{self.api_url.rstrip('/')}/{endpoint.lstrip('/')}"
-            headers = {"Content-Type": "application/json", "Accept": "application/json"}
+            # 端点 URL 按需拼一次后缓存；/chat 等热点端点后续全是查表
+            url = self._url_cache.get(endpoint)
+            if url is None:
+                url = f"{self.api_url}/{endpoint.lstrip('/')}"
+                self._url_cache[endpoint] = url
 
             # Add current agent information to request if available
-            current_agent = self.agent_manager.get_current_agent()
-            if current_agent and data:
-                data["agent_key"] = current_agent["private_key"]
-                data["environment"] = self.agent_manager.get_current_network()
-                data["agent_id"] = current_agent["address"]
-            else:
-                return
-            response = requests.post(
-                url, json=data, params=params, headers=headers, timeout=60
-            )
+            current_agent = agent if agent is not None else self.agent_manager.get_current_agent()
+            if not current_agent or not data:
+                # 以前这里静默 return None，调用方再 .get() 就炸；直接报错
+                raise RuntimeError("No agent selected for request")
+
+            # 浅拷贝合并而不是就地改写 data：调用方的字典保持原样，
+            # 也避免同一字典反复注入污染缓存键
+            payload = {
+                **data,
+                "agent_key": current_agent["private_key"],
+                "environment": net if net is not None else self.agent_manager.get_current_network(),
+                "agent_id": current_agent["address"],
+            }
 
-            response.raise_for_status()
-            return response.json()
+            cache_key = None
+            if cacheable:
+                cache_key = self._request_cache_key(endpoint, payload)
+                hit = self._resp_cache.get(cache_key)
+                if hit is not None and hit[0] > time.monotonic():
+                    return hit[1]
+
+            # orjson serializes straight to bytes, skipping the str->bytes
+            # encode that requests' json= keyword would do internally
+            body = orjson.dumps(payload)
+            if cacheable and self.hedge_delay_ms > 0:
+                # 只读查询允许对冲：重复执行没有副作用
+                result = self._hedged_post(url, body, params)
+            else:
+                result = self._post_and_decode(url, body, params)
+
+            if cache_key is not None:
+                # 简单的有界淘汰：满了先弹出最旧的插入项。
+                # 主线程/预取/对冲线程可能同时走到这里，别的线程抢先
+                # 弹掉同一个键（或清空整表）时安静跳过本次淘汰即可
+                if len(self._resp_cache) >= self._resp_cache_max:
+                    try:
+                        self._resp_cache.pop(next(iter(self._resp_cache)), None)
+                    except (StopIteration, RuntimeError):
+                        pass
+                self._resp_cache[cache_key] = (
+                    time.monotonic() + self._resp_cache_ttl,
+                    result,
+                )
+            return result
 
         except requests.exceptions.RequestException as e:
             raise Exception(f"API request failed: {str(e)}")
 
+    def _post_and_decode(self, url: str, body: bytes, params: Optional[dict]) -> dict:
+        """发送一次 POST 并解码响应（流式读入，带总量上限）"""
+        response = self.session.post(
+            url, data=body, params=params, timeout=60, stream=True
+        )
+        response.raise_for_status()
+        # 流式分块读入并限制总量，超限直接断开而不是把异常大的
+        # 回复整个装进内存
+        chunks = []
+        total = 0
+        for chunk in response.iter_content(65536):
+            total += len(chunk)
+            if total > _MAX_RESPONSE_BYTES:
+                response.close()
+                raise RuntimeError(
+                    f"Response exceeded {_MAX_RESPONSE_BYTES // (1024 * 1024)} MiB limit"
+                )
+            chunks.append(chunk)
+        # response.json() 走 stdlib json；直接用 orjson 解码原始字节
+        return orjson.loads(b"".join(chunks))
+
+    def _hedged_post(self, url: str, body: bytes, params: Optional[dict]) -> dict:
+        """对冲请求：主请求超过 hedge_delay_ms 未返回时补发一份，取先完成者
+
+        压掉偶发的长尾延迟，代价是慢请求多打一份到服务器。
+        对冲用独立的小线程池，不与动画/预取争抢同一批 worker。
+        """
+        if self._hedge_pool is None:
+            self._hedge_pool = ThreadPoolExecutor(max_workers=2)
+
+        primary = self._hedge_pool.submit(self._post_and_decode, url, body, params)
+        try:
+            return primary.result(timeout=self.hedge_delay_ms / 1000.0)
+        except FuturesTimeout:
+            pass
+
+        backup = self._hedge_pool.submit(self._post_and_decode, url, body, params)
+        last_exc = None
+        for fut in as_completed((primary, backup)):
+            try:
+                return fut.result()
+            except Exception as exc:
+                # 一份失败另一份还可能成功，两份都败才抛
+                last_exc = exc
+        raise last_exc
+
+    def _request_cache_key(self, endpoint: str, data: dict) -> bytes:
+        """计算请求的缓存键
+
+        session_id 不参与（跨会话语义相同的查询可命中），agent_key 也剔除，
+        私钥字节不进入哈希输入；agent_id 足以区分代理。进程内缓存用
+        blake2b 的 16 字节原始摘要做键即可，比 sha256 hexdigest 更快更省。
+        """
+        digest_src = {
+            "e": endpoint,
+            "d": {k: v for k, v in data.items() if k not in ("session_id", "agent_key")},
+        }
+        return hashlib.blake2b(
+            orjson.dumps(digest_src, option=orjson.OPT_SORT_KEYS), digest_size=16
+        ).digest()
+
+    def _warmup_connection(self):
+        """后台预热到服务器的 TCP/TLS 连接，把握手成本藏在横幅渲染之后"""
+        try:
+            self.session.get(self._ping_url, timeout=5)
+        except Exception:
+            # 预热失败无需打扰用户，首个真实请求会正常报告错误
+            pass
+
     def run(self):
         """Run the enhanced CLI interface"""
         self.display_banner()
+        self._executor.submit(self._warmup_connection)
 
         while True:
             try:
-                user_input = input(f"{Fore.GREEN}Command: {Style.RESET_ALL}").strip()
+                user_input = self._read_command().strip()
+
+                # 空输入直接进入下一轮，不走路由也不记历史
+                if not user_input:
+                    continue
 
-                # Split command and arguments
-                parts = user_input.split(maxsplit=1)
-                command = parts[0].lower()
-                args = parts[1] if len(parts) > 1 else ""
+                # Split command and arguments（lower 只做一次；
+                # 无空格的常见情况跳过 split 的列表分配）
+                if " " in user_input:
+                    command, args = user_input.split(maxsplit=1)
+                    command = command.lower()
+                else:
+                    command, args = user_input.lower(), ""
 
                 # Add command to history
                 self._add_to_history(user_input)
@@ -1272,27 +1455,36 @@ class InjectiveCLI:
                     continue
 
             except KeyboardInterrupt:
-                self.stop_animation()
                 print(
-                    f"\n{Fore.YELLOW}Exiting Injective Chain CLI... 👋{Style.RESET_ALL}"
+                    f"\n{_Y}Exiting Injective Chain CLI... 👋{_RST}"
                 )
-                break
+                self._shutdown()
             except Exception as e:
-                self.stop_animation()
-                print(f"{Fore.RED}Error: {str(e)}{Style.RESET_ALL}")
+                print(f"{_R}Error: {str(e)}{_RST}")
+
+        self.close()
 
 
 def main():
+    import argparse
+
     parser = argparse.ArgumentParser(description="Injective Chain CLI Client")
     parser.add_argument("--url", default="http://localhost:5000", help="API URL")
     parser.add_argument("--debug", action="store_true", help="Enable debug mode")
+    parser.add_argument(
+        "--hedge-delay",
+        type=int,
+        default=0,
+        metavar="MS",
+        help="Hedge read-only queries with a duplicate request after MS milliseconds (0 disables)",
+    )
     args = parser.parse_args()
 
     try:
-        cli = InjectiveCLI(args.url, args.debug)
+        cli = InjectiveCLI(args.url, args.debug, hedge_delay_ms=args.hedge_delay)
         cli.run()
     except Exception as e:
-        print(f"{Fore.RED}Failed to start CLI: {str(e)}{Style.RESET_ALL}")
+        print(f"{_R}Failed to start CLI: {str(e)}{_RST}")
         sys.exit(1)
 
 
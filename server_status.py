@@ -5,22 +5,55 @@
 """
 
 import asyncio
-import aiohttp
 import json
+import re
+import sys
 import time
 import os
-import psutil
 from datetime import datetime
 from collections import deque
+from itertools import islice
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 class ServerStatusMonitor:
     def __init__(self, base_url="http://localhost:5000"):
+        # 延迟导入：重依赖只在真正启动监控时加载，main()的依赖检查也因此生效
+        import psutil
         self.base_url = base_url
         self.session = None
         self.status_history = deque(maxlen=50)
-        
+        # 预热CPU采样：首次interval=None调用返回0，之后返回距上次调用的增量
+        psutil.cpu_percent(interval=None)
+        # 已匹配进程缓存 {pid: (Process, name, cmdline)}，避免每次全量扫描
+        self._tracked = {}
+        self._scan_counter = 0
+        # 预编译匹配规则：C层扫描替代逐进程的lower()+substring循环
+        self._pyname_re = re.compile(r'python', re.IGNORECASE)
+        self._target_re = re.compile(r'agent_server\.py')
+        # 上次网络计数器快照 (net_io, monotonic时刻)，用于差分计算速率
+        self._prev_net = None
+        # 磁盘用量缓存：磁盘占用几秒内不会明显变化，30秒刷新一次即可
+        self._disk_cache = (None, float('-inf'))
+        # 健康检查响应时间的滚动统计，O(1)更新，免去每tick遍历历史
+        self._rt_count = 0
+        self._rt_sum = 0.0
+        self._rt_min = float('inf')
+        self._rt_max = 0.0
+
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
+        import aiohttp
+        # 显式连接池：长驻keepalive连接，避免每次探测重新握手
+        connector = aiohttp.TCPConnector(
+            limit=32,
+            limit_per_host=16,
+            keepalive_timeout=30,
+            enable_cleanup_closed=True,
+        )
+        self.session = aiohttp.ClientSession(connector=connector)
         return self
         
     async def __aexit__(self, exc_type, exc_val, exc_tb):
@@ -29,11 +62,29 @@ class ServerStatusMonitor:
     
     def get_system_info(self):
         """获取系统信息"""
+        import psutil
         try:
-            cpu_percent = psutil.cpu_percent(interval=1)
+            # interval=None 不阻塞：返回自上次采样以来的CPU使用率
+            cpu_percent = psutil.cpu_percent(interval=None)
             memory = psutil.virtual_memory()
-            disk = psutil.disk_usage('/')
-            
+            now = time.monotonic()
+
+            disk, disk_t = self._disk_cache
+            if disk is None or now - disk_t > 30:
+                disk = psutil.disk_usage('/')
+                self._disk_cache = (disk, now)
+
+            # 累计计数器只有做差分才有意义，直接输出每秒速率
+            net_io = psutil.net_io_counters()
+            tx_bps = rx_bps = 0.0
+            if self._prev_net is not None:
+                prev, prev_t = self._prev_net
+                dt = now - prev_t
+                if dt > 0:
+                    tx_bps = (net_io.bytes_sent - prev.bytes_sent) / dt
+                    rx_bps = (net_io.bytes_recv - prev.bytes_recv) / dt
+            self._prev_net = (net_io, now)
+
             return {
                 "cpu_percent": cpu_percent,
                 "memory_percent": memory.percent,
@@ -41,41 +92,63 @@ class ServerStatusMonitor:
                 "memory_total_gb": memory.total / (1024**3),
                 "disk_percent": disk.percent,
                 "disk_used_gb": disk.used / (1024**3),
-                "disk_total_gb": disk.total / (1024**3)
+                "disk_total_gb": disk.total / (1024**3),
+                "net_tx_kbps": tx_bps / 1024,
+                "net_rx_kbps": rx_bps / 1024
             }
         except:
             return {}
     
     def get_process_info(self):
         """获取进程信息"""
+        import psutil
         try:
-            # 查找Python进程
+            # 仅在首次或每12次调用时全量扫描发现新进程（5s间隔约每分钟一次）
+            if not self._tracked or self._scan_counter % 12 == 0:
+                for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
+                    try:
+                        if proc.info['pid'] in self._tracked:
+                            continue
+                        if proc.info['name'] and self._pyname_re.search(proc.info['name']):
+                            cmdline = ' '.join(proc.info['cmdline']) if proc.info['cmdline'] else ''
+                            if self._target_re.search(cmdline):
+                                self._tracked[proc.info['pid']] = (proc, proc.info['name'], cmdline)
+                    except (psutil.NoSuchProcess, psutil.AccessDenied):
+                        continue
+            self._scan_counter += 1
+
+            # 日常tick只读取已缓存进程的指标，死进程顺手剔除
             python_processes = []
-            for proc in psutil.process_iter(['pid', 'name', 'cmdline', 'cpu_percent', 'memory_percent']):
+            for pid, (proc, name, cmdline) in list(self._tracked.items()):
                 try:
-                    if proc.info['name'] and 'python' in proc.info['name'].lower():
-                        cmdline = ' '.join(proc.info['cmdline']) if proc.info['cmdline'] else ''
-                        if 'agent_server.py' in cmdline:
-                            python_processes.append({
-                                'pid': proc.info['pid'],
-                                'name': proc.info['name'],
-                                'cpu_percent': proc.info['cpu_percent'],
-                                'memory_percent': proc.info['memory_percent'],
-                                'cmdline': cmdline
-                            })
+                    # oneshot() 批量读取同一进程的多个指标，减少系统调用
+                    with proc.oneshot():
+                        python_processes.append({
+                            'pid': pid,
+                            'name': name,
+                            'cpu_percent': proc.cpu_percent(),
+                            'memory_percent': proc.memory_percent(),
+                            'cmdline': cmdline
+                        })
                 except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
-            
+                    del self._tracked[pid]
+
             return python_processes
         except:
             return []
     
     async def check_server_health(self):
         """检查服务器健康状态"""
+        import aiohttp
         try:
-            start_time = time.time()
-            async with self.session.get(f"{self.base_url}/ping", timeout=5) as response:
-                response_time = time.time() - start_time
+            # monotonic时钟不受NTP校时/夏令时影响，耗时测量不会出现负值
+            start_time = time.monotonic()
+            # 探测超时须小于采样间隔，服务器卡死时tick延迟依然有界
+            async with self.session.get(
+                f"{self.base_url}/ping",
+                timeout=aiohttp.ClientTimeout(total=2)
+            ) as response:
+                response_time = time.monotonic() - start_time
                 
                 if response.status == 200:
                     data = await response.json()
@@ -93,6 +166,12 @@ class ServerStatusMonitor:
                         "status_code": response.status,
                         "error": f"HTTP {response.status}"
                     }
+        except asyncio.TimeoutError:
+            return {
+                "status": "timeout",
+                "response_time": 0,
+                "error": "timeout"
+            }
         except Exception as e:
             return {
                 "status": "error",
@@ -102,8 +181,9 @@ class ServerStatusMonitor:
     
     async def test_chat_endpoint(self):
         """测试聊天端点"""
+        import aiohttp
         try:
-            start_time = time.time()
+            start_time = time.monotonic()
             async with self.session.post(
                 f"{self.base_url}/chat",
                 json={
@@ -113,9 +193,9 @@ class ServerStatusMonitor:
                     "agent_key": "default",
                     "environment": "testnet"
                 },
-                timeout=10
+                timeout=aiohttp.ClientTimeout(total=4)
             ) as response:
-                response_time = time.time() - start_time
+                response_time = time.monotonic() - start_time
                 
                 if response.status == 200:
                     data = await response.json()
@@ -131,6 +211,12 @@ class ServerStatusMonitor:
                         "response_time": response_time,
                         "status_code": response.status
                     }
+        except asyncio.TimeoutError:
+            return {
+                "status": "timeout",
+                "response_time": 0,
+                "error": "timeout"
+            }
         except Exception as e:
             return {
                 "status": "error",
@@ -138,63 +224,119 @@ class ServerStatusMonitor:
                 "error": str(e)
             }
     
+    def record_response_time(self, response_time):
+        """累计响应时间统计（均值/最小/最大），O(1)更新"""
+        self._rt_count += 1
+        self._rt_sum += response_time
+        if response_time < self._rt_min:
+            self._rt_min = response_time
+        if response_time > self._rt_max:
+            self._rt_max = response_time
+
+    def get_performance_stats(self):
+        """获取响应时间统计"""
+        if not self._rt_count:
+            return None
+        return {
+            "count": self._rt_count,
+            "avg": self._rt_sum / self._rt_count,
+            "min": self._rt_min,
+            "max": self._rt_max,
+        }
+
+    def generate_report(self):
+        """导出监控报告到JSON文件，优先使用orjson序列化"""
+        if not self.status_history:
+            return None
+        report = {
+            "generated_at": datetime.now().isoformat(),
+            "server": self.base_url,
+            "performance": self.get_performance_stats(),
+            "history": list(self.status_history),
+        }
+        report_file = f"server_status_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        if orjson is not None:
+            with open(report_file, 'wb') as f:
+                f.write(orjson.dumps(report, option=orjson.OPT_INDENT_2))
+        else:
+            with open(report_file, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2, ensure_ascii=False)
+        return report_file
+
     def clear_screen(self):
         """清屏"""
-        os.system('clear' if os.name == 'posix' else 'cls')
+        if os.name == 'posix':
+            # 直接写ANSI转义序列，省去每次刷新fork一个shell
+            sys.stdout.write('\x1b[H\x1b[2J')
+            sys.stdout.flush()
+        else:
+            os.system('cls')
     
-    def print_status(self, health_result, chat_result, system_info, process_info):
+    def print_status(self, health_result, chat_result, system_info, process_info, now=None):
         """打印状态信息"""
-        self.clear_screen()
-        
-        print("🤖 Injective Agent API 服务器状态监控")
-        print("=" * 60)
-        print(f"📅 时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        print(f"🔗 服务器: {self.base_url}")
-        print("=" * 60)
-        
+        now = now or datetime.now()
+        # 整帧先拼好再一次写出：清屏+渲染合并为单次write，避免逐行刷新闪烁
+        lines = []
+        if os.name == 'posix':
+            lines.append('\x1b[H\x1b[2J🤖 Injective Agent API 服务器状态监控')
+        else:
+            self.clear_screen()
+            lines.append("🤖 Injective Agent API 服务器状态监控")
+        lines.append("=" * 60)
+        lines.append(f"📅 时间: {now.strftime('%Y-%m-%d %H:%M:%S')}")
+        lines.append(f"🔗 服务器: {self.base_url}")
+        lines.append("=" * 60)
+
         # 服务器状态
-        print("📊 服务器状态:")
+        lines.append("📊 服务器状态:")
         health_status = "✅ 正常" if health_result["status"] == "healthy" else "❌ 异常"
-        print(f"   健康检查: {health_status}")
-        print(f"   响应时间: {health_result['response_time']:.3f}s")
-        print(f"   版本: {health_result.get('version', 'N/A')}")
-        
+        lines.append(f"   健康检查: {health_status}")
+        lines.append(f"   响应时间: {health_result['response_time']:.3f}s")
+        stats = self.get_performance_stats()
+        if stats:
+            lines.append(f"   响应统计: 均值{stats['avg']:.3f}s 最小{stats['min']:.3f}s 最大{stats['max']:.3f}s")
+        lines.append(f"   版本: {health_result.get('version', 'N/A')}")
+
         chat_status = "✅ 正常" if chat_result["status"] == "success" else "❌ 异常"
-        print(f"   聊天端点: {chat_status}")
-        print(f"   聊天响应: {chat_result['response_time']:.3f}s")
-        
+        lines.append(f"   聊天端点: {chat_status}")
+        lines.append(f"   聊天响应: {chat_result['response_time']:.3f}s")
+
         # 进程信息
         if process_info:
-            print("\n🖥️  进程信息:")
+            lines.append("\n🖥️  进程信息:")
             for proc in process_info:
-                print(f"   PID: {proc['pid']}")
-                print(f"   CPU: {proc['cpu_percent']:.1f}%")
-                print(f"   内存: {proc['memory_percent']:.1f}%")
-                print(f"   命令: {proc['cmdline'][:50]}...")
+                lines.append(f"   PID: {proc['pid']}")
+                lines.append(f"   CPU: {proc['cpu_percent']:.1f}%")
+                lines.append(f"   内存: {proc['memory_percent']:.1f}%")
+                lines.append(f"   命令: {proc['cmdline'][:50]}...")
         else:
-            print("\n🖥️  进程信息: 未找到agent_server.py进程")
-        
+            lines.append("\n🖥️  进程信息: 未找到agent_server.py进程")
+
         # 系统资源
         if system_info:
-            print("\n💻 系统资源:")
-            print(f"   CPU使用率: {system_info['cpu_percent']:.1f}%")
-            print(f"   内存使用率: {system_info['memory_percent']:.1f}%")
-            print(f"   内存使用: {system_info['memory_used_gb']:.2f}GB / {system_info['memory_total_gb']:.2f}GB")
-            print(f"   磁盘使用率: {system_info['disk_percent']:.1f}%")
-            print(f"   磁盘使用: {system_info['disk_used_gb']:.2f}GB / {system_info['disk_total_gb']:.2f}GB")
-        
+            lines.append("\n💻 系统资源:")
+            lines.append(f"   CPU使用率: {system_info['cpu_percent']:.1f}%")
+            lines.append(f"   内存使用率: {system_info['memory_percent']:.1f}%")
+            lines.append(f"   内存使用: {system_info['memory_used_gb']:.2f}GB / {system_info['memory_total_gb']:.2f}GB")
+            lines.append(f"   磁盘使用率: {system_info['disk_percent']:.1f}%")
+            lines.append(f"   磁盘使用: {system_info['disk_used_gb']:.2f}GB / {system_info['disk_total_gb']:.2f}GB")
+            lines.append(f"   网络速率: ↑{system_info['net_tx_kbps']:.1f}KB/s ↓{system_info['net_rx_kbps']:.1f}KB/s")
+
         # 状态历史
         if self.status_history:
-            print("\n📈 状态历史:")
-            recent_statuses = list(self.status_history)[-5:]  # 最近5次
-            for i, status in enumerate(recent_statuses):
+            lines.append("\n📈 状态历史:")
+            # islice直接定位到末尾5条，不复制整个deque
+            recent = islice(self.status_history, max(0, len(self.status_history) - 5), None)
+            for status in recent:
                 timestamp = status.get("timestamp", "")
                 health = "✅" if status.get("health_status") == "healthy" else "❌"
                 chat = "✅" if status.get("chat_status") == "success" else "❌"
-                print(f"   {timestamp}: 健康{health} 聊天{chat}")
-        
-        print("\n" + "=" * 60)
-        print("按 Ctrl+C 停止监控")
+                lines.append(f"   {timestamp}: 健康{health} 聊天{chat}")
+
+        lines.append("\n" + "=" * 60)
+        lines.append("按 Ctrl+C 停止监控")
+        sys.stdout.write('\n'.join(lines) + '\n')
+        sys.stdout.flush()
     
     async def monitor(self, interval=5):
         """开始监控"""
@@ -203,19 +345,24 @@ class ServerStatusMonitor:
         
         try:
             while True:
-                # 获取系统信息
-                system_info = self.get_system_info()
-                process_info = self.get_process_info()
-                
-                # 检查服务器健康状态
-                health_result = await self.check_server_health()
-                
-                # 测试聊天端点
-                chat_result = await self.test_chat_endpoint()
+                # psutil采集放入线程池，与HTTP探测并发执行，互不阻塞
+                system_info, process_info, health_result, chat_result = await asyncio.gather(
+                    asyncio.to_thread(self.get_system_info),
+                    asyncio.to_thread(self.get_process_info),
+                    self.check_server_health(),
+                    self.test_chat_endpoint(),
+                )
                 
+                # 仅统计成功探测，避免错误分支的0值污染统计
+                if health_result["status"] == "healthy":
+                    self.record_response_time(health_result["response_time"])
+
+                # 每tick只取一次时钟，历史与看板时间戳保持一致
+                tick_ts = datetime.now()
+
                 # 记录状态历史
                 self.status_history.append({
-                    "timestamp": datetime.now().strftime("%H:%M:%S"),
+                    "timestamp": tick_ts.strftime("%H:%M:%S"),
                     "health_status": health_result["status"],
                     "chat_status": chat_result["status"],
                     "health_response_time": health_result.get("response_time", 0),
@@ -223,7 +370,7 @@ class ServerStatusMonitor:
                 })
                 
                 # 打印状态
-                self.print_status(health_result, chat_result, system_info, process_info)
+                self.print_status(health_result, chat_result, system_info, process_info, now=tick_ts)
                 
                 # 等待下次监控
                 await asyncio.sleep(interval)
@@ -233,12 +380,23 @@ class ServerStatusMonitor:
             print("📊 监控统计:")
             if self.status_history:
                 total_checks = len(self.status_history)
-                healthy_checks = sum(1 for s in self.status_history if s["health_status"] == "healthy")
-                chat_success = sum(1 for s in self.status_history if s["chat_status"] == "success")
+                # 单次遍历同时累计两项成功数
+                healthy_checks = chat_success = 0
+                for s in self.status_history:
+                    if s["health_status"] == "healthy":
+                        healthy_checks += 1
+                    if s["chat_status"] == "success":
+                        chat_success += 1
                 
                 print(f"   总检查次数: {total_checks}")
                 print(f"   健康检查成功率: {(healthy_checks/total_checks*100):.1f}%")
                 print(f"   聊天功能成功率: {(chat_success/total_checks*100):.1f}%")
+                stats = self.get_performance_stats()
+                if stats:
+                    print(f"   响应时间: 均值{stats['avg']:.3f}s 最小{stats['min']:.3f}s 最大{stats['max']:.3f}s")
+                report_file = self.generate_report()
+                if report_file:
+                    print(f"   报告已保存: {report_file}")
 
 async def main():
     """主函数"""
@@ -248,13 +406,20 @@ async def main():
     # 检查依赖
     try:
         import psutil
-    except ImportError:
-        print("❌ 缺少依赖: psutil")
-        print("请运行: pip install psutil")
+        import aiohttp
+    except ImportError as e:
+        print(f"❌ 缺少依赖: {e.name}")
+        print(f"请运行: pip install {e.name}")
         return
     
     async with ServerStatusMonitor() as monitor:
         await monitor.monitor()
 
 if __name__ == "__main__":
+    # uvloop为可选加速项：libuv事件循环降低每次await的调度开销
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
     asyncio.run(main())